@@ -24,6 +24,7 @@ echo "Starting Gunicorn..."
 exec gunicorn ttstats.wsgi:application \
   --bind 0.0.0.0:8000 \
   --workers 3 \
+  --preload \
   --forwarded-allow-ips '*' \
   --timeout 60 \
   --access-logfile - \
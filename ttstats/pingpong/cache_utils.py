@@ -42,8 +42,9 @@ def invalidate_match_caches(match):
         'dashboard_recent_matches',
     ])
 
-    # Invalidate leaderboard by bumping generation counter
+    # Invalidate leaderboard and calendars by bumping generation counters
     invalidate_leaderboard()
+    invalidate_calendar()
 
     cache.delete_many(keys_to_delete)
     logger.debug('Invalidated %d cache keys for match %s', len(keys_to_delete), match.pk)
@@ -60,8 +61,9 @@ def invalidate_player_caches(player):
         'dashboard_total_players',
     ]
 
-    # Invalidate leaderboard
+    # Invalidate leaderboard and calendars (they show player names)
     invalidate_leaderboard()
+    invalidate_calendar()
 
     cache.delete_many(keys_to_delete)
     logger.debug('Invalidated caches for player %s', player.pk)
@@ -75,6 +77,14 @@ def invalidate_leaderboard():
         cache.set('leaderboard_generation', 1, timeout=None)
 
 
+def invalidate_calendar():
+    """Invalidate all cached calendar months by bumping generation."""
+    try:
+        cache.incr('calendar_generation')
+    except ValueError:
+        cache.set('calendar_generation', 1, timeout=None)
+
+
 def invalidate_all_caches():
     """Clear all TTStats caches. Use for testing or major data migrations."""
     cache.clear()
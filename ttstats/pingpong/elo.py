@@ -63,7 +63,7 @@ def update_player_elo(match):
     from .models import EloHistory, Match
 
     # Guard: Must have winner
-    if not match.winner:
+    if match.winner_id is None:
         logger.debug(f"Skipping Elo update for match {match.pk}: no winner")
         return
 
@@ -103,8 +103,8 @@ def update_player_elo(match):
             r2 = team2_players[0].elo_rating
 
         # 2. DETERMINE OUTCOME (1 = Team 1 wins, 0 = Team 2 wins)
-        # We check if the winner object is the same as the team1 object
-        if match.winner == match.team1:
+        # Compare ids so neither team has to be loaded
+        if match.winner_id == match.team1_id:
             s1 = 1
         else:
             s1 = 0
@@ -1,11 +1,81 @@
 import logging
+import threading
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives, get_connection, send_mail
 
 logger = logging.getLogger(__name__)
 
 
+def site_url(path):
+    """Build an absolute URL for path from settings.SITE_PROTOCOL and SITE_DOMAIN."""
+    protocol = getattr(settings, "SITE_PROTOCOL", "http")
+    domain = getattr(settings, "SITE_DOMAIN", "localhost:8000")
+    return f"{protocol}://{domain}{path}"
+
+
+def _run_in_background(deliver):
+    """
+    Run deliver on a daemon thread if settings.EMAIL_ASYNC, else inline.
+
+    Returns deliver's result when run inline, or None once the thread is started.
+    """
+    if getattr(settings, "EMAIL_ASYNC", False):
+        threading.Thread(target=deliver, daemon=True).start()
+        return None
+    return deliver()
+
+
+def send_mail_in_background(subject, message, recipient_list, **kwargs):
+    """
+    Send an email without holding up the current request.
+
+    When settings.EMAIL_ASYNC is enabled the SMTP exchange runs on a daemon
+    thread; otherwise the email is sent inline. Failures are logged, not raised.
+
+    Returns True or False for an inline send, depending on whether it
+    succeeded, and None when delivery was handed off to a thread.
+    """
+    def deliver():
+        try:
+            send_mail(
+                subject=subject,
+                message=message,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                recipient_list=recipient_list,
+                fail_silently=False,
+                **kwargs,
+            )
+            logger.info(f"Email '{subject}' sent to {', '.join(recipient_list)}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send email '{subject}' to {', '.join(recipient_list)}: {e}")
+            return False
+
+    return _run_in_background(deliver)
+
+
+def send_messages_in_background(email_messages):
+    """
+    Send several prepared emails over a single SMTP connection.
+
+    Delivery follows the same EMAIL_ASYNC rules as send_mail_in_background.
+    """
+    if not email_messages:
+        return
+
+    def deliver():
+        recipients = ", ".join(r for msg in email_messages for r in msg.to)
+        try:
+            with get_connection(fail_silently=False) as connection:
+                connection.send_messages(email_messages)
+            logger.info(f"{len(email_messages)} email(s) sent to {recipients}")
+        except Exception as e:
+            logger.error(f"Failed to send emails to {recipients}: {e}")
+
+    _run_in_background(deliver)
+
+
 def send_match_confirmation_email(match, player):
     """
     Helper function to send confirmation email to a player.
@@ -16,40 +86,26 @@ def send_match_confirmation_email(match, player):
     """
     user = player.user
 
-    player_team = None
-    opponent_team = None
-
+    # Scores come from the denormalized cache columns, which are up to date
+    # once the match has been saved with its winner
     if player in match.team1.players.all():
         player_team, opponent_team = match.team1, match.team2
-        score = f"{match.team1_score}-{match.team2_score}"
-        opponent_name = f"{match.team2}"
+        score = f"{match.team1_score_cache}-{match.team2_score_cache}"
     elif player in match.team2.players.all():
         player_team, opponent_team = match.team2, match.team1
-        score = f"{match.team2_score}-{match.team1_score}"
-        opponent_name = f"{match.team1}"
+        score = f"{match.team2_score_cache}-{match.team1_score_cache}"
     else:
         return
 
-    # Determine result for this player
-    if player in match.winner.players.all():
+    # Determine result for this player (their team is known, so compare ids)
+    if match.winner_id == player_team.pk:
         result = "won"
         emoji = "🎉"
-        if player in match.team1.players.all():
-            score = f"{match.team1_score}-{match.team2_score}"
-        else:
-            score = f"{match.team2_score}-{match.team1_score}"
     else:
         result = "lost"
         emoji = "💪"
-        if player in match.team1.players.all():
-            score = f"{match.team1_score}-{match.team2_score}"
-        else:
-            score = f"{match.team2_score}-{match.team1_score}"
 
-    # Build absolute URL
-    protocol = getattr(settings, "SITE_PROTOCOL", "http")
-    domain = getattr(settings, "SITE_DOMAIN", "localhost:8000")
-    confirmation_url = f"{protocol}://{domain}/pingpong/matches/{match.pk}/"
+    confirmation_url = site_url(f"/pingpong/matches/{match.pk}/")
 
     subject = f"{emoji} Match Complete - Please Confirm"
 
@@ -105,18 +161,7 @@ Table Tennis Tracker Team
     </html>
     """
 
-    try:
-        send_mail(
-            subject=subject,
-            message=message,
-            html_message=html_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
-        logger.info(f"Match confirmation email sent to {user.email} for match {match.pk}")
-    except Exception as e:
-        logger.error(f"Failed to send match confirmation email to {user.email}: {e}")
+    send_mail_in_background(subject, message, [user.email], html_message=html_message)
 
 
 def send_scheduled_match_email(scheduled_match, player):
@@ -127,14 +172,31 @@ def send_scheduled_match_email(scheduled_match, player):
         scheduled_match: ScheduledMatch instance
         player: Player who is being notified
     """
+    send_scheduled_match_emails(scheduled_match, [player])
+
+
+def send_scheduled_match_emails(scheduled_match, players):
+    """
+    Notify several players about a scheduled match over one SMTP connection.
+
+    Args:
+        scheduled_match: ScheduledMatch instance
+        players: Players who are being notified
+    """
+    email_messages = [
+        msg for msg in (_build_scheduled_match_email(scheduled_match, p) for p in players)
+        if msg is not None
+    ]
+    send_messages_in_background(email_messages)
+
+
+def _build_scheduled_match_email(scheduled_match, player):
+    """Build the scheduled match notification for a player, or None if they have no email."""
     user = player.user
     if not user or not user.email:
-        return
+        return None
 
-    # Build absolute URL
-    protocol = getattr(settings, "SITE_PROTOCOL", "http")
-    domain = getattr(settings, "SITE_DOMAIN", "localhost:8000")
-    calendar_url = f"{protocol}://{domain}/pingpong/calendar/"
+    calendar_url = site_url("/pingpong/calendar/")
 
     # Format date and time
     date_str = scheduled_match.scheduled_date.strftime("%A, %B %d, %Y")
@@ -189,28 +251,21 @@ Table Tennis Tracker Team
     </html>
     """
 
-    try:
-        send_mail(
-            subject=subject,
-            message=message,
-            html_message=html_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
-        logger.info(f"Scheduled match email sent to {user.email}")
-    except Exception as e:
-        logger.error(f"Failed to send scheduled match email to {user.email}: {e}")
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+    )
+    email.attach_alternative(html_message, "text/html")
+    return email
 
 
 def send_passkey_registered_email(user, device_name):
     """Notify user when new passkey is registered"""
     subject = "New Passkey Registered - TTStats"
 
-    # Build absolute URL
-    protocol = getattr(settings, "SITE_PROTOCOL", "http")
-    domain = getattr(settings, "SITE_DOMAIN", "localhost:8000")
-    passkey_url = f"{protocol}://{domain}/pingpong/passkeys/"
+    passkey_url = site_url("/pingpong/passkeys/")
 
     message = f"""Hi {user.username},
 
@@ -252,28 +307,14 @@ If you have any concerns, please contact support.
     </html>
     """
 
-    try:
-        send_mail(
-            subject=subject,
-            message=message,
-            html_message=html_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
-        logger.info(f"Passkey registered email sent to {user.email}")
-    except Exception as e:
-        logger.error(f"Failed to send passkey registered email to {user.email}: {e}")
+    send_mail_in_background(subject, message, [user.email], html_message=html_message)
 
 
 def send_passkey_deleted_email(user, device_name):
     """Notify user when passkey is deleted"""
     subject = "Passkey Removed - TTStats"
 
-    # Build absolute URL
-    protocol = getattr(settings, "SITE_PROTOCOL", "http")
-    domain = getattr(settings, "SITE_DOMAIN", "localhost:8000")
-    passkey_url = f"{protocol}://{domain}/pingpong/passkeys/"
+    passkey_url = site_url("/pingpong/passkeys/")
 
     message = f"""Hi {user.username},
 
@@ -315,18 +356,7 @@ Consider changing your password if you suspect unauthorized access.
     </html>
     """
 
-    try:
-        send_mail(
-            subject=subject,
-            message=message,
-            html_message=html_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
-        logger.info(f"Passkey deleted email sent to {user.email}")
-    except Exception as e:
-        logger.error(f"Failed to send passkey deleted email to {user.email}: {e}")
+    send_mail_in_background(subject, message, [user.email], html_message=html_message)
 
 
 def send_verification_email(user_profile):
@@ -335,10 +365,7 @@ def send_verification_email(user_profile):
     token = user_profile.create_verification_token()
     user_profile.save()
 
-    # Build absolute URL
-    protocol = getattr(settings, "SITE_PROTOCOL", "http")
-    domain = getattr(settings, "SITE_DOMAIN", "localhost:8000")
-    verification_url = f"{protocol}://{domain}/pingpong/verify-email/{token}/"
+    verification_url = site_url(f"/pingpong/verify-email/{token}/")
 
     subject = "Verify Your Email - TTStats"
 
@@ -378,15 +405,4 @@ If you didn't create an account, you can safely ignore this email.
     </html>
     """
 
-    try:
-        send_mail(
-            subject=subject,
-            message=message,
-            html_message=html_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
-        logger.info(f"Verification email sent to {user.email}")
-    except Exception as e:
-        logger.error(f"Failed to send verification email to {user.email}: {e}")
+    send_mail_in_background(subject, message, [user.email], html_message=html_message)
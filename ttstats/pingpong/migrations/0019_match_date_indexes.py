@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-16 10:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pingpong', '0018_populate_match_cache_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['-date_played'], name='match_date_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['is_confirmed', '-date_played'], name='match_conf_date_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-16 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pingpong', '0019_match_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='email_verification_token',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
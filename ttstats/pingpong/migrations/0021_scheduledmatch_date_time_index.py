@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-16 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pingpong', '0020_userprofile_verification_token_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scheduledmatch',
+            index=models.Index(fields=['scheduled_date', 'scheduled_time'], name='sched_date_time_idx'),
+        ),
+    ]
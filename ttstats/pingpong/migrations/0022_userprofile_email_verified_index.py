@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-16 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pingpong', '0021_scheduledmatch_date_time_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='email_verified',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+    ]
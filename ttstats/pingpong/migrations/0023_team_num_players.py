@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-16 15:10
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_num_players(apps, schema_editor):
+    Team = apps.get_model('pingpong', 'Team')
+    for team in Team.objects.annotate(player_count=Count('players')).iterator():
+        if team.player_count:
+            Team.objects.filter(pk=team.pk).update(num_players=team.player_count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pingpong', '0022_userprofile_email_verified_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='num_players',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(populate_num_players, migrations.RunPython.noop),
+    ]
@@ -96,12 +96,16 @@ class Team(models.Model):
     players = models.ManyToManyField(Player, related_name="teams")
     name = models.CharField(max_length=100, blank=True)
 
+    # Denormalized player count, kept in sync by signals on team membership
+    num_players = models.PositiveSmallIntegerField(default=0, db_index=True, editable=False)
+
     def __str__(self):
         if self.name:
             return self.name
 
         # Default: "Player1 and Player2"
-        players_list = self.players.order_by('name').all()
+        # Sort in Python so prefetched players are reused
+        players_list = sorted(self.players.all(), key=lambda p: p.name)
         if len(players_list) == 1:
             return str(players_list[0])
         elif len(players_list) == 2:
@@ -180,6 +184,11 @@ class Match(models.Model):
     class Meta:
         ordering = ["-date_played"]
         verbose_name_plural = "matches"
+        indexes = [
+            # Default ordering and confirmed-only listings
+            models.Index(fields=["-date_played"], name="match_date_desc_idx"),
+            models.Index(fields=["is_confirmed", "-date_played"], name="match_conf_date_idx"),
+        ]
 
     def __str__(self):
         return f"{self.team1} vs {self.team2} - {self.date_played.date()}"
@@ -194,37 +203,25 @@ class Match(models.Model):
 
     @property
     def team1_confirmed(self):
-        """All Team 1 members have confirmed"""
-        team1_players = self.team1.players.filter(user__profile__email_verified=True)
-        team1_ids = {p.id for p in team1_players}
-        confirmed_ids = {c.id for c in self.confirmations.all()}
-
-        if team1_ids.issubset(confirmed_ids):
-            return True
-
-        all_unverified = all(
-            not (p.user and p.user.profile.email_verified)
-            for p in team1_players.all()
+        """All verified Team 1 members have confirmed"""
+        team1_ids = set(
+            self.team1.players.filter(
+                user__profile__email_verified=True
+            ).values_list('id', flat=True)
         )
-
-        return all_unverified
+        confirmed_ids = {c.id for c in self.confirmations.all()}
+        return team1_ids.issubset(confirmed_ids)
 
     @property
     def team2_confirmed(self):
-        """All Team 2 members have confirmed"""
-        team2_players = self.team2.players.filter(user__profile__email_verified=True)
-        team2_ids = {p.id for p in team2_players}
-        confirmed_ids = {c.id for c in self.confirmations.all()}
-
-        if team2_ids.issubset(confirmed_ids):
-            return True
-
-        all_unverified = all(
-            not (p.user and p.user.profile.email_verified)
-            for p in team2_players.all()
+        """All verified Team 2 members have confirmed"""
+        team2_ids = set(
+            self.team2.players.filter(
+                user__profile__email_verified=True
+            ).values_list('id', flat=True)
         )
-
-        return all_unverified
+        confirmed_ids = {c.id for c in self.confirmations.all()}
+        return team2_ids.issubset(confirmed_ids)
 
     @property
     def match_confirmed(self):
@@ -235,44 +232,44 @@ class Match(models.Model):
     def player1(self):
         """Backward-compatible property: returns first player from team1"""
         if self.team1:
-            return self.team1.players.first()
+            # Same player as .first() (Meta ordering is by name), but reuses prefetched players
+            return min(self.team1.players.all(), key=lambda p: (p.name, p.pk), default=None)
         return None
 
     @property
     def player2(self):
         """Backward-compatible property: returns first player from team2"""
         if self.team2:
-            return self.team2.players.first()
+            # Same player as .first() (Meta ordering is by name), but reuses prefetched players
+            return min(self.team2.players.all(), key=lambda p: (p.name, p.pk), default=None)
         return None
 
     def should_auto_confirm(self):
-        if not self.winner or self.match_confirmed:
+        if self.winner_id is None or self.match_confirmed:
             return False
 
-        team1_all_unverified = True
-        for player in self.team1.players.all():
-            if player.user and player.user.profile.email_verified:
-                team1_all_unverified = False
-                break
-
-        team2_all_unverified = True
-        for player in self.team2.players.all():
-            if player.user and player.user.profile.email_verified:
-                team2_all_unverified = False
-                break
-
-        return team1_all_unverified or team2_all_unverified
+        # Teams that have at least one verified player
+        verified_team_ids = set(
+            Team.players.through.objects.filter(
+                team_id__in=(self.team1_id, self.team2_id),
+                player__user__profile__email_verified=True,
+            ).values_list('team_id', flat=True)
+        )
+        return (
+            self.team1_id not in verified_team_ids
+            or self.team2_id not in verified_team_ids
+        )
 
     def get_unverified_players(self):
-        unverified = []
-
-        all_players = (self.team1.players.all() | self.team2.players.all())
-
-        for player in all_players:
-            if not player.user or not player.user.profile.email_verified:
-                unverified.append(player)
-
-        return unverified
+        """Players in this match without a verified email, in one query"""
+        return list(
+            Player.objects.filter(
+                models.Q(teams=self.team1_id) | models.Q(teams=self.team2_id)
+            ).filter(
+                models.Q(user__isnull=True)
+                | models.Q(user__profile__email_verified=False)
+            ).distinct()
+        )
 
     def update_cache_fields(self):
         """Update all denormalized cache fields. Call from signals after changes."""
@@ -371,8 +368,8 @@ class UserProfile(models.Model):
     """Extended user profile for additional information"""
 
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
-    email_verified = models.BooleanField(default=False)
-    email_verification_token = models.CharField(max_length=64, blank=True)
+    email_verified = models.BooleanField(default=False, db_index=True)
+    email_verification_token = models.CharField(max_length=64, blank=True, db_index=True)
     email_verification_sent_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -449,6 +446,10 @@ class ScheduledMatch(models.Model):
         ordering = ["scheduled_date", "scheduled_time"]
         verbose_name = "Scheduled Match"
         verbose_name_plural = "Scheduled Matches"
+        indexes = [
+            # Default ordering, month ranges and upcoming matches
+            models.Index(fields=["scheduled_date", "scheduled_time"], name="sched_date_time_idx"),
+        ]
 
     def __str__(self):
         return f"{self.team1} vs {self.team2} - {self.scheduled_date} at {self.scheduled_time}"
@@ -479,14 +480,16 @@ class ScheduledMatch(models.Model):
     def player1(self):
         """Backward-compatible property: returns first player from team1"""
         if self.team1:
-            return self.team1.players.first()
+            # Same player as .first() (Meta ordering is by name), but reuses prefetched players
+            return min(self.team1.players.all(), key=lambda p: (p.name, p.pk), default=None)
         return None
 
     @property
     def player2(self):
         """Backward-compatible property: returns first player from team2"""
         if self.team2:
-            return self.team2.players.first()
+            # Same player as .first() (Meta ordering is by name), but reuses prefetched players
+            return min(self.team2.players.all(), key=lambda p: (p.name, p.pk), default=None)
         return None
 
     @property
@@ -1,11 +1,17 @@
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save, pre_save, post_delete
+from django.db.models import Count, Q
+from django.db.models.signals import m2m_changed, post_save, pre_save, post_delete, pre_delete
 from django.dispatch import receiver
 from django_otp_webauthn.models import WebAuthnCredential
 
-from .cache_utils import invalidate_match_caches, invalidate_player_caches
+from .cache_utils import (
+    invalidate_calendar,
+    invalidate_leaderboard,
+    invalidate_match_caches,
+    invalidate_player_caches,
+)
 from .emails import send_match_confirmation_email, send_passkey_registered_email
-from .models import Game, Match, MatchConfirmation, Player, UserProfile
+from .models import Game, Location, Match, MatchConfirmation, Player, ScheduledMatch, Team, UserProfile
 from .elo import update_player_elo
 
 
@@ -24,9 +30,14 @@ def create_user_profile(sender, instance, created, **kwargs):
             userprofile.save()
 
 
+# Match fields the leaderboard filters or aggregates on
+LEADERBOARD_FIELDS = ("team1_id", "team2_id", "winner_id", "is_double", "date_played")
+
+
 @receiver(pre_save, sender=Match)
 def track_match_winner_change(sender, instance, **kwargs):
-    """Remember if winner is being set for the first time"""
+    """Remember if winner is being set for the first time, or if ranked fields change"""
+    instance._leaderboard_fields_changed = False
     if not instance.pk:
         instance._winner_just_set = False
         return
@@ -34,6 +45,11 @@ def track_match_winner_change(sender, instance, **kwargs):
     try:
         old_match = sender.objects.get(pk=instance.pk)
         instance._winner_just_set = (old_match.winner_id is None)
+        # A first winner is handled by handle_match_completion
+        instance._leaderboard_fields_changed = old_match.winner_id is not None and any(
+            getattr(old_match, field) != getattr(instance, field)
+            for field in LEADERBOARD_FIELDS
+        )
     except sender.DoesNotExist:
         instance._winner_just_set = False
 
@@ -42,7 +58,7 @@ def track_match_winner_change(sender, instance, **kwargs):
 def handle_match_completion(sender, instance, created, **kwargs):
     """Handle match completion tasks"""
     # Only process if winner was just set
-    if not getattr(instance, "_winner_just_set", False) or not instance.winner:
+    if not getattr(instance, "_winner_just_set", False) or instance.winner_id is None:
         return
 
     # 1. Auto-confirm if needed
@@ -56,15 +72,16 @@ def handle_match_completion(sender, instance, created, **kwargs):
         instance.refresh_from_db()
     else:
         # 2. Send confirmation emails (only to verified users who need to confirm)
-        for player in (instance.team1.players.all() | instance.team2.players.all()):
-            if (
-                    player.user
-                    and player.user.email
-                    and hasattr(player.user, 'profile')
-                    and player.user.profile.email_verified
-                    and player.id not in [c.player_id for c in instance.confirmations.all()]
-            ):
-                send_match_confirmation_email(instance, player)
+        players_to_notify = Player.objects.filter(
+            Q(teams=instance.team1_id) | Q(teams=instance.team2_id),
+            user__profile__email_verified=True,
+        ).exclude(
+            user__email=""
+        ).exclude(
+            pk__in=MatchConfirmation.objects.filter(match=instance).values("player_id")
+        ).select_related("user").distinct()
+        for player in players_to_notify:
+            send_match_confirmation_email(instance, player)
 
     # 3. Update is_confirmed denormalized field
     new_confirmed = instance._calculate_confirmation_status()
@@ -121,6 +138,88 @@ def invalidate_caches_on_game_save(sender, instance, **kwargs):
     invalidate_match_caches(instance.match)
 
 
+@receiver(post_delete, sender=Match)
+def invalidate_caches_on_match_delete(sender, instance, **kwargs):
+    """Invalidate cached stats (head-to-head, player, leaderboard, calendar) for a removed match."""
+    if instance.team1_id is None or instance.team2_id is None:
+        invalidate_leaderboard()
+        invalidate_calendar()
+        return
+    invalidate_match_caches(instance)
+
+
+@receiver(post_save, sender=Match)
+def invalidate_leaderboard_on_match_edit(sender, instance, created, **kwargs):
+    """Invalidate cached leaderboards when a completed match's ranked fields are edited."""
+    if getattr(instance, "_leaderboard_fields_changed", False):
+        invalidate_leaderboard()
+
+
+@receiver(post_delete, sender=Game)
+def invalidate_leaderboard_on_game_delete(sender, instance, **kwargs):
+    """Invalidate cached leaderboards when a game is removed."""
+    invalidate_leaderboard()
+
+
+@receiver(post_save, sender=ScheduledMatch)
+@receiver(post_delete, sender=ScheduledMatch)
+def invalidate_calendar_on_change(sender, instance, **kwargs):
+    """Invalidate cached calendars when matches are scheduled, edited or unscheduled."""
+    invalidate_calendar()
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_calendar_on_name_change(sender, instance, **kwargs):
+    """Invalidate cached calendars when teams or locations are renamed or removed."""
+    invalidate_calendar()
+
+
+@receiver(m2m_changed, sender=Team.players.through)
+def update_team_num_players(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep Team.num_players in sync when team membership changes."""
+    if reverse and action == "pre_clear":
+        # A player's teams are about to be cleared; remember which ones
+        instance._cleared_team_ids = list(instance.teams.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        team_ids = [instance.pk]
+    elif action == "post_clear":
+        team_ids = getattr(instance, "_cleared_team_ids", [])
+    else:
+        team_ids = pk_set
+
+    for team in _recount_team_players(team_ids):
+        if not reverse:
+            instance.num_players = team.player_count
+
+
+@receiver(pre_delete, sender=Player)
+def remember_player_team_ids(sender, instance, **kwargs):
+    """Remember a player's teams; the cascade to memberships skips m2m_changed."""
+    instance._deleted_team_ids = list(instance.teams.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Player)
+def update_team_num_players_on_player_delete(sender, instance, **kwargs):
+    """Recount the teams a deleted player belonged to."""
+    _recount_team_players(getattr(instance, "_deleted_team_ids", []))
+
+
+def _recount_team_players(team_ids):
+    """Store the current player count on each of the given teams and return them."""
+    teams = list(Team.objects.filter(pk__in=team_ids).annotate(player_count=Count("players")))
+    for team in teams:
+        if team.num_players != team.player_count:
+            Team.objects.filter(pk=team.pk).update(num_players=team.player_count)
+    return teams
+
+
 @receiver(post_save, sender=Player)
 def invalidate_on_player_save(sender, instance, created, **kwargs):
     """Invalidate caches when player is created or updated."""
@@ -1,17 +1,24 @@
 """Tests for Redis cache functionality."""
+from datetime import date
+from unittest.mock import patch
+
 import pytest
 from django.core.cache import cache
+from django.db.models import Model
 from django.test import Client
 from django.urls import reverse
 
 from .conftest import (
     GameFactory,
+    LocationFactory,
     MatchFactory,
     PlayerFactory,
+    ScheduledMatchFactory,
     UserFactory,
     confirm_match,
 )
 from pingpong.cache_utils import (
+    invalidate_calendar,
     invalidate_match_caches,
     invalidate_player_caches,
     invalidate_leaderboard,
@@ -76,6 +83,34 @@ class TestCacheInvalidation:
         new_gen = cache.get('leaderboard_generation')
         assert new_gen > initial_gen
 
+    def test_leaderboard_cache_invalidated_on_match_edit_and_delete(self):
+        """Editing a completed match's ranked fields or deleting it should bump leaderboard generation."""
+        match = MatchFactory(player1=PlayerFactory(), player2=PlayerFactory())
+        match.winner = match.team1
+        match.save()
+        confirm_match(match)
+
+        cache.set('leaderboard_generation', 1, timeout=None)
+        match.notes = 'Rematch next week'
+        match.save()
+        assert cache.get('leaderboard_generation') == 1
+
+        match.date_played = match.date_played.replace(year=2020)
+        match.save()
+        assert cache.get('leaderboard_generation') == 2
+
+        Match._base_manager.get(pk=match.pk).delete()
+        assert cache.get('leaderboard_generation') > 2
+
+    def test_game_save_bumps_leaderboard_once(self):
+        """A game's match re-save should not add a second leaderboard bump."""
+        match = MatchFactory(player1=PlayerFactory(), player2=PlayerFactory())
+        GameFactory(match=match, game_number=1)
+
+        cache.set('leaderboard_generation', 1, timeout=None)
+        GameFactory(match=match, game_number=2)
+        assert cache.get('leaderboard_generation') == 2
+
     def test_head_to_head_cache_invalidated(self):
         """H2H cache should be cleared when those players play a new match."""
         p1 = PlayerFactory(with_user=True)
@@ -93,6 +128,20 @@ class TestCacheInvalidation:
         # H2H cache should be cleared
         assert cache.get(cache_key) is None
 
+    def test_head_to_head_cache_invalidated_on_match_delete(self):
+        """Deleting a match should drop the cached head-to-head payload."""
+        p1 = PlayerFactory(with_user=True)
+        p2 = PlayerFactory(with_user=True)
+        match = MatchFactory(player1=p1, player2=p2)
+        confirm_match(match)
+
+        cache_key = f'h2h_{min(p1.pk, p2.pk)}_{max(p1.pk, p2.pk)}'
+        cache.set(cache_key, {'data': 1}, 1800)
+
+        Match._base_manager.get(pk=match.pk).delete()
+
+        assert cache.get(cache_key) is None
+
     def test_pending_matches_cache_invalidated(self):
         """Pending matches count should be cleared on match changes."""
         p1 = PlayerFactory(with_user=True)
@@ -275,6 +324,22 @@ class TestCachedDashboard:
         resp = c.get(reverse("pingpong:dashboard"))
         assert resp.context['total_matches'] == 999
 
+    def test_dashboard_reads_all_cached_values(self):
+        """Dashboard should serve every cached figure without recomputing it."""
+        u, p = _verified_user_with_player()
+        c = _login_client(u)
+
+        cache.set_many({
+            'dashboard_total_players': 7,
+            'dashboard_total_matches': 3,
+            'dashboard_recent_matches': [],
+        })
+
+        resp = c.get(reverse("pingpong:dashboard"))
+        assert resp.context['total_players'] == 7
+        assert resp.context['total_matches'] == 3
+        assert resp.context['recent_matches'] == []
+
 
 @pytest.mark.django_db
 class TestCachedLeaderboard:
@@ -412,6 +477,71 @@ class TestCachedHeadToHead:
         assert resp.context['has_data'] is False
 
 
+@pytest.mark.django_db
+class TestCachedCalendar:
+    """Test calendar month caching."""
+
+    def test_calendar_served_from_cache(self):
+        """Second request for the same month should not rebuild the grid."""
+        u, p = _verified_user_with_player()
+        c = _login_client(u)
+        params = {"year": 2025, "month": 6}
+
+        weeks1 = c.get(reverse("pingpong:calendar"), params).context['calendar_weeks']
+        with patch("pingpong.views._month_grid") as month_grid:
+            weeks2 = c.get(reverse("pingpong:calendar"), params).context['calendar_weeks']
+
+        month_grid.assert_not_called()
+        assert [d['date'] for w in weeks1 for d in w] == [d['date'] for w in weeks2 for d in w]
+
+    def test_scheduling_invalidates_calendar(self):
+        """Scheduling a match should show up on the next calendar render."""
+        u, p = _verified_user_with_player()
+        c = _login_client(u)
+        params = {"year": 2025, "month": 6}
+        c.get(reverse("pingpong:calendar"), params)
+
+        sm = ScheduledMatchFactory(player1=p, scheduled_date=date(2025, 6, 10))
+
+        weeks = c.get(reverse("pingpong:calendar"), params).context['calendar_weeks']
+        shown = [m.pk for w in weeks for d in w for m in d['matches']]
+        assert sm.pk in shown
+
+    def test_team_and_location_changes_invalidate_calendar(self):
+        """Renaming or removing a team or location should bump calendar generation."""
+        sm = ScheduledMatchFactory(location=LocationFactory())
+
+        cache.set('calendar_generation', 1, timeout=None)
+        sm.team1.name = "Renamed"
+        sm.team1.save()
+        assert cache.get('calendar_generation') == 2
+
+        sm.location.name = "New Hall"
+        sm.location.save()
+        assert cache.get('calendar_generation') == 3
+
+        sm.location.delete()
+        assert cache.get('calendar_generation') > 3
+
+    def test_calendar_caches_plain_values(self):
+        """The cached grid holds plain snapshots, not model instances."""
+        u, p = _verified_user_with_player()
+        c = _login_client(u)
+        ScheduledMatchFactory(player1=p, scheduled_date=date(2025, 6, 10))
+
+        weeks = c.get(reverse("pingpong:calendar"), {"year": 2025, "month": 6}).context['calendar_weeks']
+        entries = [m for w in weeks for d in w for m in d['matches']]
+        assert entries
+        assert not any(isinstance(m, Model) for m in entries)
+        assert entries[0].player1_name == p.name
+
+    def test_invalidate_calendar_initializes_generation(self):
+        """Test calendar generation initialization when not set."""
+        cache.delete('calendar_generation')
+        invalidate_calendar()
+        assert cache.get('calendar_generation') == 1
+
+
 # ===========================================================================
 # Denormalized Fields
 # ===========================================================================
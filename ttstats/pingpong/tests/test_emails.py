@@ -1,8 +1,15 @@
+from unittest.mock import patch
+
 import pytest
 from django.core import mail
 from django.test import override_settings
 
-from pingpong.emails import send_match_confirmation_email, send_scheduled_match_email
+from pingpong.emails import (
+    send_mail_in_background,
+    send_match_confirmation_email,
+    send_scheduled_match_email,
+    send_scheduled_match_emails,
+)
 from .conftest import (
     GameFactory,
     LocationFactory,
@@ -62,6 +69,18 @@ class TestSendMatchConfirmationEmail:
         send_match_confirmation_email(m, m.player1)
         assert mail.outbox[0].to == [m.player1.user.email]
 
+    @override_settings(EMAIL_ASYNC=True)
+    def test_sent_off_the_request_thread(self):
+        m = self._make_complete_match()
+        mail.outbox.clear()
+        with patch("pingpong.emails.threading.Thread") as thread_cls:
+            send_match_confirmation_email(m, m.player1)
+        thread_cls.assert_called_once()
+        assert len(mail.outbox) == 0
+
+        thread_cls.call_args.kwargs["target"]()
+        assert mail.outbox[0].alternatives[0][1] == "text/html"
+
     def test_url_construction_default(self):
         m = self._make_complete_match()
         mail.outbox.clear()
@@ -134,3 +153,53 @@ class TestSendScheduledMatchEmail:
         mail.outbox.clear()
         send_scheduled_match_email(sm, sm.player1)
         assert "Match Scheduled" in mail.outbox[0].subject
+
+    @override_settings(EMAIL_ASYNC=True)
+    def test_sent_off_the_request_thread(self):
+        sm = ScheduledMatchFactory()
+        mail.outbox.clear()
+        with patch("pingpong.emails.threading.Thread") as thread_cls:
+            send_scheduled_match_email(sm, sm.player1)
+        thread_cls.assert_called_once()
+        assert len(mail.outbox) == 0
+
+    def test_both_players_share_one_connection(self):
+        sm = ScheduledMatchFactory()
+        mail.outbox.clear()
+        with patch("pingpong.emails.get_connection", wraps=mail.get_connection) as get_conn:
+            send_scheduled_match_emails(sm, [sm.player1, sm.player2])
+        get_conn.assert_called_once()
+        assert len(mail.outbox) == 2
+        assert mail.outbox[0].alternatives[0][1] == "text/html"
+
+
+class TestSendMailInBackground:
+    def test_sends_inline_by_default(self):
+        mail.outbox.clear()
+        assert send_mail_in_background("Subject", "Body", ["a@example.com"]) is True
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ["a@example.com"]
+
+    @override_settings(EMAIL_ASYNC=True)
+    def test_sends_on_thread_when_async(self):
+        mail.outbox.clear()
+        with patch("pingpong.emails.threading.Thread") as thread_cls:
+            assert send_mail_in_background("Subject", "Body", ["a@example.com"]) is None
+        thread_cls.assert_called_once()
+        assert thread_cls.call_args.kwargs["daemon"] is True
+        assert len(mail.outbox) == 0
+
+        # Running the target delivers the email
+        thread_cls.call_args.kwargs["target"]()
+        assert len(mail.outbox) == 1
+
+    def test_failure_is_logged_not_raised(self, caplog):
+        with patch("pingpong.emails.send_mail", side_effect=OSError("smtp down")) as send:
+            assert send_mail_in_background("Subject", "Body", ["a@example.com"]) is False
+        send.assert_called_once()
+        assert send.call_args.kwargs["recipient_list"] == ["a@example.com"]
+        errors = [r for r in caplog.records if r.levelname == "ERROR"]
+        assert len(errors) == 1
+        assert errors[0].name == "pingpong.emails"
+        assert "smtp down" in errors[0].getMessage()
+        assert "a@example.com" in errors[0].getMessage()
@@ -2,7 +2,7 @@ import pytest
 from django.contrib.auth.models import AnonymousUser
 
 from pingpong.models import Game, Match, Player, ScheduledMatch
-from ttstats.middleware import _thread_locals
+from ttstats.middleware import _current_user
 from .conftest import (
     GameFactory,
     MatchFactory,
@@ -13,19 +13,18 @@ from .conftest import (
 
 
 def _set_current_user(user):
-    """Set thread-local user for manager filtering."""
-    _thread_locals.user = user
+    """Set the request-local user for manager filtering."""
+    _current_user.set(user)
 
 
 def _clear_current_user():
-    """Clear thread-local user."""
-    if hasattr(_thread_locals, "user"):
-        del _thread_locals.user
+    """Clear the request-local user."""
+    _current_user.set(None)
 
 
 @pytest.fixture(autouse=True)
-def clean_thread_locals():
-    """Ensure thread-local is clean before and after each test."""
+def clean_current_user():
+    """Ensure no user is set before and after each test."""
     _clear_current_user()
     yield
     _clear_current_user()
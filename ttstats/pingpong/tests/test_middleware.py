@@ -1,21 +1,19 @@
 import pytest
 from django.test import RequestFactory
 
-from ttstats.middleware import CurrentUserMiddleware, _thread_locals, get_current_user
+from ttstats.middleware import CurrentUserMiddleware, _current_user, get_current_user
 from .conftest import UserFactory
 
 
 class TestGetCurrentUser:
     def test_returns_none_when_not_set(self):
-        if hasattr(_thread_locals, "user"):
-            del _thread_locals.user
         assert get_current_user() is None
 
     def test_returns_user_when_set(self, db):
         u = UserFactory()
-        _thread_locals.user = u
+        token = _current_user.set(u)
         assert get_current_user() == u
-        del _thread_locals.user
+        _current_user.reset(token)
 
 
 @pytest.mark.django_db
@@ -62,3 +60,15 @@ class TestCurrentUserMiddleware:
         with pytest.raises(ValueError):
             middleware(request)
         assert get_current_user() is None
+
+    def test_restores_outer_user_after_request(self):
+        outer = UserFactory()
+        token = _current_user.set(outer)
+
+        middleware = CurrentUserMiddleware(lambda request: "response")
+        request = RequestFactory().get("/")
+        request.user = UserFactory()
+
+        middleware(request)
+        assert get_current_user() == outer
+        _current_user.reset(token)
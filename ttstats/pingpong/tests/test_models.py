@@ -3,7 +3,7 @@ from django.test import TestCase
 from django.utils import timezone
 from datetime import timedelta, datetime
 
-from pingpong.models import Location, Player, Match, Game, UserProfile, Team, MatchConfirmation
+from pingpong.models import Location, Player, Match, Game, UserProfile, Team, MatchConfirmation, ScheduledMatch
 
 
 class LocationModelTest(TestCase):
@@ -136,6 +136,31 @@ class TeamModelTest(TestCase):
     def test_teams_name_with_more_than_two_players(self):
         self.assertEqual(f"{self.team3}", "Player Four and Player One (+2)")
 
+    def test_num_players_follows_membership(self):
+        self.assertEqual(self.team3.num_players, 4)
+        self.team3.players.remove(self.player4)
+        self.team3.refresh_from_db()
+        self.assertEqual(self.team3.num_players, 3)
+
+    def test_num_players_updated_when_player_teams_cleared(self):
+        self.player1.teams.clear()
+        self.team1.refresh_from_db()
+        self.team3.refresh_from_db()
+        self.assertEqual(self.team1.num_players, 0)
+        self.assertEqual(self.team3.num_players, 3)
+
+    def test_num_players_updated_when_team_member_deleted(self):
+        self.player1.delete()
+        self.team1.refresh_from_db()
+        self.team3.refresh_from_db()
+        self.assertEqual(self.team1.num_players, 0)
+        self.assertEqual(self.team3.num_players, 3)
+
+        # Deleting the user cascades to the player and is counted too
+        self.user2.delete()
+        self.team3.refresh_from_db()
+        self.assertEqual(self.team3.num_players, 2)
+
 
 class MatchModelTest(TestCase):
     """Tests for the Match model"""
@@ -355,6 +380,27 @@ class MatchModelTest(TestCase):
         self.assertTrue(match.team2_confirmed)
         self.assertTrue(match.match_confirmed)
     
+    def test_doubles_representative_player_follows_name_ordering(self):
+        """player1/player2 match .first(), which orders by name rather than pk"""
+        # team_double2: "Player Three" has the lower pk, "Player Four" sorts first
+        match = Match.objects.create(
+            team1=self.team_double1,
+            team2=self.team_double2
+        )
+        scheduled = ScheduledMatch.objects.create(
+            team1=self.team_double1,
+            team2=self.team_double2,
+            scheduled_date=timezone.now().date(),
+            scheduled_time="18:00",
+        )
+        for obj in (match, scheduled):
+            self.assertEqual(obj.player1, self.team_double1.players.first())
+            self.assertEqual(obj.player2, self.team_double2.players.first())
+            self.assertEqual(obj.player2, self.player4)
+
+        prefetched = Match.objects.prefetch_related("team2__players").get(pk=match.pk)
+        self.assertEqual(prefetched.player2, self.player4)
+
     def test_player_scores_empty_match(self):
         """Test player scores for match with no games"""
         match = Match.objects.create(
@@ -599,6 +645,23 @@ class MatchModelTest(TestCase):
 
         unverified = match.get_unverified_players()
         self.assertEqual(len(unverified), 0)
+
+    def test_get_unverified_players_includes_players_without_user(self):
+        """Players with no account count as unverified, found in one query"""
+        self.user1.profile.email_verified = True
+        self.user1.profile.save()
+        guest = Player.objects.create(name="Guest")
+        guest_team = Team.objects.create()
+        guest_team.players.set([guest])
+
+        match = Match.objects.create(
+            team1=self.team1,
+            team2=guest_team
+        )
+
+        with self.assertNumQueries(1):
+            unverified = match.get_unverified_players()
+        self.assertEqual(unverified, [guest])
     
     def test_user_can_edit_own_singles_match(self):
         """Test user can edit matches they participate in"""
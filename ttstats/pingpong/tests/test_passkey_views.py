@@ -108,3 +108,40 @@ class TestPasskeyManagement:
         content = response.content.decode()
         assert 'Device 1' in content
         assert 'Device 2' in content
+
+    def test_passkey_management_lists_newest_first(self, client):
+        """Most recently registered passkey is listed first"""
+        player = PlayerFactory(with_user=True)
+        user = player.user
+        client.force_login(user)
+
+        WebAuthnCredential.objects.create(
+            user=user,
+            credential_id=b'old',
+            public_key=b'pubkey1',
+            name="Old Device"
+        )
+        WebAuthnCredential.objects.create(
+            user=user,
+            credential_id=b'new',
+            public_key=b'pubkey2',
+            name="New Device"
+        )
+
+        response = client.get(reverse('pingpong:passkey_management'))
+        names = [c.name for c in response.context['credentials']]
+        assert names == ["New Device", "Old Device"]
+
+    def test_delete_passkey_rejects_malformed_id(self, client):
+        """Non-numeric credential ids are rejected without a lookup"""
+        player = PlayerFactory(with_user=True)
+        client.force_login(player.user)
+
+        response = client.post(
+            reverse('pingpong:passkey_management'),
+            {'credential_id': 'not-a-number'}
+        )
+        assert response.status_code == 302
+        assert response.url == reverse('pingpong:passkey_management')
+        messages = [str(m) for m in response.wsgi_request._messages]
+        assert messages == ["Invalid passkey id."]
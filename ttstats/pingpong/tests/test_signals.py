@@ -2,7 +2,7 @@ from django.contrib.auth.models import User
 from django.test import TestCase
 from django.core import mail
 
-from pingpong.models import Player, Match, Game, Team, UserProfile
+from pingpong.models import Player, Match, MatchConfirmation, Game, Team, UserProfile
 
 
 class UserProfileSignalTest(TestCase):
@@ -214,6 +214,26 @@ class MatchCompletionSignalTest(TestCase):
         self.assertIn(self.user3.email, recipients)
         self.assertIn(self.user4.email, recipients)
 
+    def test_no_email_for_player_who_already_confirmed(self):
+        """Players who confirmed before the winner was set are not emailed"""
+        self.user1.profile.email_verified = True
+        self.user1.profile.save()
+        self.user2.profile.email_verified = True
+        self.user2.profile.save()
+
+        match = Match.objects.create(
+            team1=self.team1, team2=self.team2, best_of=5
+        )
+        MatchConfirmation.objects.create(match=match, player=self.player1)
+
+        for n, score in enumerate((5, 9, 7), start=1):
+            Game.objects.create(
+                match=match, game_number=n, team1_score=11, team2_score=score
+            )
+
+        recipients = [email.to[0] for email in mail.outbox]
+        self.assertEqual(recipients, [self.user2.email])
+
     def test_no_emails_for_one_verified_one_unverified_singles(self):
         """Test auto-confirm when one player is verified, one is not"""
         # Only player1 verified
@@ -0,0 +1,24 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from ttstats.urls import _normalize_admin_url
+
+
+class TestNormalizeAdminUrl:
+    @pytest.mark.parametrize("value, expected", [
+        ("admin/", "admin/"),
+        ("secret-admin", "secret-admin/"),
+        ("  /secret_admin/  ", "secret_admin/"),
+        ("nested/admin", "nested/admin/"),
+    ])
+    def test_normalizes_to_single_trailing_slash(self, value, expected):
+        assert _normalize_admin_url(value) == expected
+
+    @pytest.mark.parametrize("value", ["", "   ", "/", "//"])
+    def test_rejects_empty_value(self, value):
+        with pytest.raises(ImproperlyConfigured):
+            _normalize_admin_url(value)
+
+    def test_rejects_converter_syntax(self):
+        with pytest.raises(ImproperlyConfigured):
+            _normalize_admin_url("admin/<int:pk>/")
@@ -1,11 +1,18 @@
+import json
+from unittest.mock import patch
+
 import pytest
 from datetime import date, timedelta, time
+from django.contrib.messages import get_messages
 from django.core import mail
+from django.core.cache import cache
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
-from pingpong.models import EloHistory, Game, Match, Player, ScheduledMatch
+from pingpong.models import EloHistory, Game, Match, Player, ScheduledMatch, Team
 from .conftest import (
     GameFactory,
     LocationFactory,
@@ -74,6 +81,19 @@ class TestDashboardView:
         resp = c.get(reverse("pingpong:dashboard"))
         assert "pingpong/dashboard.html" in [t.name for t in resp.templates]
 
+    def test_recent_match_scores_do_not_query_games(self):
+        u, p = _verified_user_with_player()
+        match = MatchFactory(player1=p)
+        for n in range(1, 4):
+            GameFactory(match=match, game_number=n, team1_score=11, team2_score=5)
+        c = _login_client(u)
+        c.get(reverse("pingpong:dashboard"))  # warm the dashboard caches
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = c.get(reverse("pingpong:dashboard"))
+        assert resp.context["recent_matches"][0].team1_score_cache == 3
+        assert not [q for q in ctx.captured_queries if "pingpong_game" in q["sql"]]
+
 
 # ===========================================================================
 # PlayerListView
@@ -142,6 +162,32 @@ class TestPlayerDetailView:
         assert resp.context["current_streak"] == 2
         assert resp.context["streak_type"] == "win"
 
+    def test_mixed_results_counted(self):
+        u, p = _verified_user_with_player()
+        other = PlayerFactory(with_user=True)
+        now = timezone.now()
+        # Oldest: a win, then a more recent loss
+        for days_ago, p1_wins in ((2, True), (1, False)):
+            m = MatchFactory(player1=p, player2=other, date_played=now - timedelta(days=days_ago))
+            for n in range(1, 4):
+                if p1_wins:
+                    GameFactory(match=m, game_number=n, team1_score=11, team2_score=5)
+                else:
+                    GameFactory(match=m, game_number=n, team1_score=5, team2_score=11)
+            confirm_match(m)
+
+        c = _login_client(u)
+        resp = c.get(reverse("pingpong:player_detail", args=[p.pk]))
+        assert resp.context["total_matches"] == 2
+        assert resp.context["wins"] == 1
+        assert resp.context["losses"] == 1
+        assert resp.context["longest_win_streak"] == 1
+        assert resp.context["longest_loss_streak"] == 1
+
+        # Most recent first: the loss, then the win
+        assert [m.player_won for m in resp.context["matches"]] == [False, True]
+        assert [(m.p1_score, m.p2_score) for m in resp.context["matches"]] == [(0, 3), (3, 0)]
+
 
 # ===========================================================================
 # PlayerCreateView
@@ -239,6 +285,24 @@ class TestMatchDetailView:
         resp = c.get(reverse("pingpong:match_detail", args=[99999]))
         assert resp.status_code == 404
 
+    def test_elo_changes_split_by_team(self):
+        u, p = _verified_user_with_player()
+        other = PlayerFactory(with_user=True)
+        m = MatchFactory(player1=p, player2=other)
+        for player, change in ((other, -12), (p, 12)):
+            EloHistory.objects.create(
+                match=m,
+                player=player,
+                old_rating=1500,
+                new_rating=1500 + change,
+                rating_change=change,
+                k_factor=32.0,
+            )
+        c = _login_client(u)
+        resp = c.get(reverse("pingpong:match_detail", args=[m.pk]))
+        assert resp.context["player1_elo_change"].player == p
+        assert resp.context["player2_elo_change"].player == other
+
 
 # ===========================================================================
 # MatchCreateView
@@ -261,6 +325,31 @@ class TestMatchCreateView:
         form = resp.context["form"]
         assert form.fields["player1"].disabled is True
 
+    def test_non_staff_excluded_from_opponent_choices(self):
+        u, p = _verified_user_with_player()
+        other = PlayerFactory(with_user=True)
+        c = _login_client(u)
+        resp = c.get(reverse("pingpong:match_add"))
+        form = resp.context["form"]
+        for field_name in ("player2", "player3", "player4"):
+            choices = list(form.fields[field_name].queryset)
+            assert p not in choices
+            assert other in choices
+
+    def test_opponent_selects_share_one_query(self):
+        staff, _ = _staff_with_player()
+        PlayerFactory.create_batch(3)
+        c = _login_client(staff)
+        c.get(reverse("pingpong:match_add"))
+        with CaptureQueriesContext(connection) as ctx:
+            resp = c.get(reverse("pingpong:match_add"))
+        assert resp.status_code == 200
+        player_selects = [
+            q for q in ctx.captured_queries
+            if 'FROM "pingpong_player"' in q["sql"] and "WHERE" not in q["sql"]
+        ]
+        assert len(player_selects) == 2  # player1 select + shared opponents
+
     def test_non_staff_forced_as_player1(self):
         u, p = _verified_user_with_player()
         other = PlayerFactory(with_user=True)
@@ -292,6 +381,29 @@ class TestMatchCreateView:
         })
         assert resp.status_code == 200  # re-renders form with error
 
+    def test_singles_reuses_one_player_team_not_doubles_team(self):
+        u, p = _verified_user_with_player()
+        other = PlayerFactory(with_user=True)
+        partner = PlayerFactory()
+        doubles_team = Team.objects.create()
+        doubles_team.players.set([p, partner])
+        singles_team = Team.objects.create()
+        singles_team.players.set([p])
+        c = _login_client(u)
+        resp = c.post(reverse("pingpong:match_add"), {
+            "player1": p.pk,
+            "player2": other.pk,
+            "date_played": timezone.now().strftime("%Y-%m-%dT%H:%M"),
+            "match_type": "casual",
+            "best_of": 5,
+            "notes": "",
+        })
+        assert resp.status_code == 302
+        match = Match.objects.get(team2__players=other)
+        assert match.team1_id == singles_team.pk
+        # The newly created opponent team records its size
+        assert match.team2.num_players == 1
+
 
 # ===========================================================================
 # MatchUpdateView
@@ -349,6 +461,16 @@ class TestGameCreateView:
         resp = c.get(reverse("pingpong:game_add", args=[m.pk]))
         assert resp.context["next_game_number"] == 1
 
+    def test_auto_game_number_after_existing_games(self):
+        u, p = _verified_user_with_player()
+        other = PlayerFactory(with_user=True)
+        m = MatchFactory(player1=p, player2=other)
+        GameFactory(match=m, game_number=1, team1_score=11, team2_score=5)
+        GameFactory(match=m, game_number=2, team1_score=5, team2_score=11)
+        c = _login_client(u)
+        resp = c.get(reverse("pingpong:game_add", args=[m.pk]))
+        assert resp.context["next_game_number"] == 3
+
     def test_add_game(self):
         u, p = _verified_user_with_player()
         other = PlayerFactory(with_user=True)
@@ -395,6 +517,21 @@ class TestGameCreateView:
         assert m.winner == m.team1
         assert p in m.winner.players.all()
 
+    def test_completion_messages_use_saved_match_state(self):
+        u, p = _verified_user_with_player()
+        other = PlayerFactory(with_user=True)  # unverified, so auto-confirms
+        m = MatchFactory(player1=p, player2=other, best_of=3)
+        GameFactory(match=m, game_number=1, team1_score=11, team2_score=5)
+        c = _login_client(u)
+        resp = c.post(reverse("pingpong:game_add", args=[m.pk]), {
+            "game_number": 2,
+            "team1_score": 11,
+            "team2_score": 9,
+        })
+        texts = [str(msg) for msg in get_messages(resp.wsgi_request)]
+        assert any("wins 2-0" in t for t in texts)
+        assert any("auto-confirmed" in t for t in texts)
+
 
 # ===========================================================================
 # LeaderboardView
@@ -436,7 +573,7 @@ class TestLeaderboardView:
         c = _login_client(u)
         resp = c.get(reverse("pingpong:leaderboard"))
         stats = resp.context["player_stats"]
-        p_stat = next(s for s in stats if s["player"] == p)
+        p_stat = next(s for s in stats if s["player"]["pk"] == p.pk)
         # Only the confirmed match should count
         assert p_stat["total_matches"] == 1
         assert p_stat["wins"] == 1
@@ -456,7 +593,65 @@ class TestLeaderboardView:
         resp = c.get(reverse("pingpong:leaderboard"))
         stats = resp.context["player_stats"]
         # p should be first (100% win rate)
-        assert stats[0]["player"] == p
+        assert stats[0]["player"]["pk"] == p.pk
+
+    def test_losses_and_games_counted(self):
+        u, p = _verified_user_with_player()
+        other = PlayerFactory(with_user=True)
+
+        # other wins as team1, 3-1
+        m = MatchFactory(player1=other, player2=p)
+        GameFactory(match=m, game_number=1, team1_score=11, team2_score=5)
+        GameFactory(match=m, game_number=2, team1_score=5, team2_score=11)
+        GameFactory(match=m, game_number=3, team1_score=11, team2_score=7)
+        GameFactory(match=m, game_number=4, team1_score=11, team2_score=9)
+        confirm_match(m)
+
+        c = _login_client(u)
+        resp = c.get(reverse("pingpong:leaderboard"))
+        stats = {s["player"]["pk"]: s for s in resp.context["player_stats"]}
+        assert stats[p.pk]["wins"] == 0
+        assert stats[p.pk]["losses"] == 1
+        assert stats[p.pk]["total_games"] == 4
+        assert stats[other.pk]["wins"] == 1
+        assert stats[other.pk]["win_rate"] == 100
+
+    def test_top_x_keeps_highest_rated(self):
+        u, p = _verified_user_with_player()
+        others = [PlayerFactory(with_user=True) for _ in range(3)]
+        for other in others:
+            m = MatchFactory(player1=p, player2=other)
+            for n in range(1, 4):
+                GameFactory(match=m, game_number=n, team1_score=11, team2_score=5)
+            confirm_match(m)
+        Player.objects.filter(pk=others[0].pk).update(elo_rating=1700)
+
+        c = _login_client(u)
+        resp = c.get(reverse("pingpong:leaderboard"), {"top_x": 2})
+        stats = resp.context["player_stats"]
+        assert len(stats) == 2
+        assert stats[0]["player"]["pk"] == others[0].pk
+        assert stats[1]["player"]["pk"] == p.pk
+
+    def test_rows_are_plain_values(self):
+        u, p = _verified_user_with_player()
+        p.nickname = "Spinner"
+        p.playing_style = "hard_rubber"
+        p.save()
+        other = PlayerFactory(with_user=True)
+        m = MatchFactory(player1=p, player2=other)
+        for n in range(1, 4):
+            GameFactory(match=m, game_number=n, team1_score=11, team2_score=5)
+        confirm_match(m)
+
+        c = _login_client(u)
+        resp = c.get(reverse("pingpong:leaderboard"))
+        row = next(s for s in resp.context["player_stats"] if s["player"]["pk"] == p.pk)
+        assert row["player"]["display_name"] == "Spinner"
+        assert row["player"]["playing_style_display"] == p.get_playing_style_display()
+        content = resp.content.decode()
+        assert "Spinner" in content
+        assert p.get_playing_style_display() in content
 
 
 # ===========================================================================
@@ -496,6 +691,72 @@ class TestHeadToHeadStatsView:
         resp = c.get(reverse("pingpong:head_to_head"), {"player1": p1.pk, "player2": p2.pk})
         assert resp.context["has_data"] is False
 
+    def test_game_stats_oriented_to_player1(self):
+        u, p1 = _verified_user_with_player()
+        p2 = PlayerFactory(with_user=True)
+        now = timezone.now()
+
+        # p1 as team1: 11-5, 11-9, 11-7
+        m = MatchFactory(player1=p1, player2=p2, date_played=now - timedelta(days=2))
+        for n, (t1, t2) in enumerate([(11, 5), (11, 9), (11, 7)], 1):
+            GameFactory(match=m, game_number=n, team1_score=t1, team2_score=t2)
+        confirm_match(m)
+
+        # p1 as team2: 3-11, 11-4, 9-11, 8-11 from p1's side
+        m = MatchFactory(player1=p2, player2=p1, date_played=now - timedelta(days=1))
+        for n, (t1, t2) in enumerate([(11, 3), (4, 11), (11, 9), (11, 8)], 1):
+            GameFactory(match=m, game_number=n, team1_score=t1, team2_score=t2)
+        confirm_match(m)
+
+        c = _login_client(u)
+        resp = c.get(reverse("pingpong:head_to_head"), {"player1": p1.pk, "player2": p2.pk})
+        ctx = resp.context
+        assert ctx["player1_match_wins"] == 1
+        assert ctx["player2_match_wins"] == 1
+        assert ctx["total_games"] == 7
+        assert ctx["player1_game_wins"] == 4
+        assert ctx["player2_game_wins"] == 3
+        assert ctx["close_games"] == 2
+        assert ctx["player1_dominant"] == 2
+        assert ctx["player2_dominant"] == 1
+        assert ctx["player1_max_margin"] == 7
+        assert ctx["player2_max_margin"] == 8
+        assert ctx["avg_point_diff"] == pytest.approx(32 / 7)
+        assert ctx["avg_p1_score"] == pytest.approx(64 / 7)
+        assert [d["difference"] for d in json.loads(ctx["point_differences_json"])] == [
+            6, 2, 4, -8, 7, -2, -3,
+        ]
+        assert [m["margin"] for m in json.loads(ctx["match_margins_json"])] == [3, 2]
+        assert json.loads(ctx["cumulative_avg_json"]) == [3.0, 2.5]
+        assert ctx["player1_recent_wins"] == 1
+        assert ctx["player2_recent_wins"] == 1
+        assert [m.pk for m in ctx["matches"]][-1] == Match.objects.order_by("date_played").first().pk
+
+    def test_query_count_independent_of_match_count(self):
+        u, p1 = _verified_user_with_player()
+        p2 = PlayerFactory(with_user=True)
+        c = _login_client(u)
+
+        def add_match():
+            m = MatchFactory(player1=p1, player2=p2)
+            for n in range(1, 4):
+                GameFactory(match=m, game_number=n, team1_score=11, team2_score=6)
+            confirm_match(m)
+
+        def render_queries():
+            cache.clear()  # measure the uncached path
+            with CaptureQueriesContext(connection) as ctx:
+                resp = c.get(reverse("pingpong:head_to_head"), {"player1": p1.pk, "player2": p2.pk})
+            assert resp.status_code == 200
+            return len(ctx.captured_queries)
+
+        add_match()
+        render_queries()  # warm up per-session queries
+        baseline = render_queries()
+        for _ in range(3):
+            add_match()
+        assert render_queries() == baseline
+
 
 # ===========================================================================
 # PlayerRegistrationView
@@ -539,6 +800,25 @@ class TestPlayerRegistrationView:
         assert len(mail.outbox) == 1
         assert "verify" in mail.outbox[0].body.lower()
 
+    def test_verification_email_failure_reported(self):
+        c = Client()
+        with patch("pingpong.emails.send_mail", side_effect=OSError("smtp down")):
+            resp = c.post(reverse("pingpong:signup"), {
+                "username": "mailfail",
+                "email": "mailfail@example.com",
+                "password1": "Str0ngP@ssw0rd!",
+                "password2": "Str0ngP@ssw0rd!",
+                "full_name": "Mail Fail",
+                "nickname": "",
+                "playing_style": "normal",
+            })
+        assert resp.status_code == 200
+        assert Player.objects.filter(name="Mail Fail").exists()
+        assert resp.context["email_failed"] is True
+        content = resp.content.decode()
+        assert "couldn&#x27;t send the verification email" in content
+        assert "We've sent a verification link" not in content
+
     def test_registration_rate_limited(self):
         """Test that registration is rate limited after too many attempts"""
         c = Client()
@@ -679,6 +959,41 @@ class TestEmailResendVerificationView:
         assert resp.status_code == 302
         assert len(mail.outbox) == 1
 
+    def test_resend_link_uses_site_domain(self, settings):
+        settings.SITE_PROTOCOL = "https"
+        settings.SITE_DOMAIN = "example.com"
+        u = UserFactory()
+        u.profile.email_verified = False
+        u.profile.save()
+        mail.outbox.clear()
+        c = _login_client(u)
+        c.post(reverse("pingpong:email_resend_verification"))
+        u.profile.refresh_from_db()
+        assert f"https://example.com/pingpong/verify-email/{u.profile.email_verification_token}/" in mail.outbox[0].body
+
+    def test_resend_reports_inline_failure(self):
+        u = UserFactory()
+        u.profile.email_verified = False
+        u.profile.save()
+        c = _login_client(u)
+        with patch("pingpong.emails.send_mail", side_effect=OSError("smtp down")):
+            resp = c.post(reverse("pingpong:email_resend_verification"))
+        assert [str(m) for m in resp.wsgi_request._messages] == [
+            "Failed to send verification email. Please try again later."
+        ]
+
+    def test_resend_reports_success_when_queued(self, settings):
+        settings.EMAIL_ASYNC = True
+        u = UserFactory()
+        u.profile.email_verified = False
+        u.profile.save()
+        c = _login_client(u)
+        with patch("pingpong.emails.threading.Thread"):
+            resp = c.post(reverse("pingpong:email_resend_verification"))
+        assert [str(m) for m in resp.wsgi_request._messages] == [
+            f"Verification email sent! Check your inbox at {u.email}"
+        ]
+
     def test_already_verified(self):
         u = UserFactory()
         u.profile.email_verified = True
@@ -787,6 +1102,15 @@ class TestScheduledMatchCreateView:
         # Both players should get notification
         assert len(mail.outbox) == 2
         assert ScheduledMatch.objects.count() == 1
+        assert ScheduledMatch.objects.get().notification_sent is True
+        scheduled_for = date.today() + timedelta(days=3)
+        success = [str(m) for m in resp.wsgi_request._messages]
+        assert success == [
+            f"Match scheduled for {scheduled_for.strftime('%B %d, %Y')}! Notifications sent to both players."
+        ]
+        assert resp.url == (
+            f"{reverse('pingpong:calendar')}?year={scheduled_for.year}&month={scheduled_for.month}"
+        )
 
 
 # ===========================================================================
@@ -849,6 +1173,92 @@ class TestCalendarView:
                     found = True
         assert found
 
+    def test_confirmed_and_unconfirmed_completed_matches(self):
+        u, p = _verified_user_with_player()
+        other_user = UserFactory()
+        other_user.profile.email_verified = True
+        other_user.profile.save()
+        other = PlayerFactory(user=other_user)
+        now = timezone.now()
+
+        confirmed = MatchFactory(player1=p, player2=other, date_played=now)
+        for n in range(1, 4):
+            GameFactory(match=confirmed, game_number=n, team1_score=11, team2_score=5)
+        confirm_match(confirmed)
+
+        # Both players verified, so this one stays unconfirmed
+        pending = MatchFactory(player1=p, player2=other, date_played=now)
+        for n in range(1, 4):
+            GameFactory(match=pending, game_number=n, team1_score=11, team2_score=5)
+
+        c = _login_client(u)
+        resp = c.get(reverse("pingpong:calendar"), {"year": now.year, "month": now.month})
+        shown = [
+            m.pk
+            for week in resp.context["calendar_weeks"]
+            for day in week
+            for m in day["matches"]
+        ]
+        assert confirmed.pk in shown
+        assert pending.pk not in shown
+
+    def test_month_range_boundaries(self):
+        u, p = _verified_user_with_player()
+        inside = ScheduledMatchFactory(player1=p, scheduled_date=date(2025, 6, 30))
+        outside = ScheduledMatchFactory(player1=p, scheduled_date=date(2025, 7, 1))
+        c = _login_client(u)
+        resp = c.get(reverse("pingpong:calendar"), {"year": 2025, "month": 6})
+        shown = [
+            m.pk
+            for week in resp.context["calendar_weeks"]
+            for day in week
+            for m in day["matches"]
+        ]
+        assert inside.pk in shown
+        assert outside.pk not in shown
+
+    def test_query_count_independent_of_match_count(self):
+        u, p = _verified_user_with_player()
+        today = timezone.now().date()
+        c = _login_client(u)
+
+        def render_queries():
+            cache.clear()  # measure the uncached path
+            with CaptureQueriesContext(connection) as ctx:
+                resp = c.get(reverse("pingpong:calendar"), {"year": today.year, "month": today.month})
+            assert resp.status_code == 200
+            return len(ctx.captured_queries)
+
+        ScheduledMatchFactory(player1=p, scheduled_date=today, location=LocationFactory())
+        render_queries()  # warm up per-session queries
+        baseline = render_queries()
+        for _ in range(3):
+            ScheduledMatchFactory(player1=p, scheduled_date=today, location=LocationFactory())
+        assert render_queries() == baseline
+
+
+# ===========================================================================
+# TeamDetailView
+# ===========================================================================
+
+@pytest.mark.django_db
+class TestTeamDetailView:
+    def test_scores_from_team_perspective(self):
+        u, p = _verified_user_with_player()
+        other = PlayerFactory(with_user=True)
+        match = MatchFactory(player1=p, player2=other)
+        for n in range(1, 4):
+            GameFactory(match=match, game_number=n, team1_score=11, team2_score=5)
+        confirm_match(match)
+
+        c = _login_client(u)
+        resp = c.get(reverse("pingpong:team_detail", args=[match.team2_id]))
+        assert resp.status_code == 200
+        listed = resp.context["matches"][0]
+        assert (listed.team_score, listed.opponent_score) == (0, 3)
+        assert listed.team_won is False
+        assert resp.context["losses"] == 1
+
 
 # ===========================================================================
 # Match Confirmation Elo Update
@@ -1,21 +1,27 @@
+import calendar
+import heapq
 import json
 import logging
+from collections import defaultdict
+from functools import lru_cache
+from itertools import accumulate
+from types import SimpleNamespace
 from typing import Any
 
-from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LoginView
 from django.core.cache import cache
-from django.core.mail import send_mail
-from django.core.serializers.json import DjangoJSONEncoder
-from django.db.models import Count, F, Q, Sum
-from django.http import HttpResponse
+from django.db import transaction
+from django.db.models import Avg, Case, Count, Exists, F, Max, OuterRef, Prefetch, Q, Subquery, Sum, When
+from django.db.models.functions import Abs, Coalesce
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.utils.decorators import method_decorator
+from django.utils.formats import date_format
 from django.views import View
 from django.views.generic import (
     CreateView,
@@ -31,7 +37,7 @@ logger = logging.getLogger(__name__)
 
 from .forms import GameForm, MatchEditForm, MatchForm, PlayerRegistrationForm, ScheduledMatchForm, MatchConvertForm
 from .models import Game, Location, Match, Player, UserProfile, MatchConfirmation, ScheduledMatch, Team
-from .emails import send_scheduled_match_email, send_passkey_deleted_email
+from .emails import send_mail_in_background, send_scheduled_match_emails, send_passkey_deleted_email, site_url
 
 try:
     from django_otp_webauthn.models import WebAuthnCredential
@@ -39,6 +45,46 @@ except ImportError:
     WebAuthnCredential = None
 
 
+def get_user_player(user):
+    """Return the user's Player or None (the lookup is cached on the user instance)"""
+    return getattr(user, "player", None)
+
+
+def get_or_create_team(*players):
+    """Return the team made up of exactly these players, creating it if needed.
+
+    Teams carry a denormalized num_players count, so an exact match is a
+    plain filter on each player plus the team size, with no aggregate.
+    """
+    player_ids = {player.pk for player in players}
+    teams = Team.objects.filter(num_players=len(player_ids))
+    for player_id in player_ids:
+        teams = teams.filter(players=player_id)
+    team = teams.order_by('pk').first()
+    if not team:
+        # Team row and memberships go in together; players.add() fires
+        # m2m_changed, which keeps num_players in sync
+        with transaction.atomic():
+            team = Team.objects.create()
+            team.players.add(*player_ids)
+    return team
+
+
+def _team_players(team):
+    """Prefetched players of a team as a list, empty when there is no team"""
+    return list(team.players.all()) if team is not None else []
+
+
+def _attach_team_players(matches):
+    """Store each match's prefetched team and winner players as plain lists for the template"""
+    for match in matches:
+        match.cached_team1_players = _team_players(match.team1)
+        match.cached_team2_players = _team_players(match.team2)
+        match.cached_winner_players = _team_players(match.winner)
+        match.cached_player1 = next(iter(match.cached_team1_players), None)
+        match.cached_player2 = next(iter(match.cached_team2_players), None)
+
+
 # Create your views here.
 class PlayerListView(LoginRequiredMixin, ListView):
     """View to list all players"""
@@ -58,15 +104,17 @@ class MatchListView(LoginRequiredMixin, ListView):
     paginate_by = 10
 
     def get_queryset(self):
+        # The list only shows player names, so keep player rows narrow and
+        # skip the free-text notes column
+        players = Player.objects.only("id", "name", "nickname")
         return (
             Match.objects.all()
             .select_related("team1", "team2", "location", "winner")
+            .defer("notes", "created_at", "updated_at")
             .prefetch_related(
-                "team1__players__user__profile",
-                "team2__players__user__profile",
-                "winner__players__user__profile",
-                "games",
-                "confirmations",
+                Prefetch("team1__players", queryset=players),
+                Prefetch("team2__players", queryset=players),
+                Prefetch("winner__players", queryset=players),
             )
             .order_by("-date_played")
         )
@@ -74,78 +122,22 @@ class MatchListView(LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Cache scores using prefetched games data to avoid N+1 queries
-        # Games are already loaded via prefetch_related, so this is free
+        # Scores and confirmation status are read from the denormalized
+        # team*_score_cache / is_confirmed columns in the template
         page_obj = context.get('page_obj')
         if page_obj:
             matches = page_obj.object_list
         else:
             matches = context.get('matches', [])
 
-        for match in matches:
-            # Force evaluation of prefetched data and cache as lists
-            # This prevents template from triggering new queries
-            games = list(match.games.all())
-            match.cached_team1_score = sum(
-                1 for g in games if g.winner_id == match.team1_id
-            )
-            match.cached_team2_score = sum(
-                1 for g in games if g.winner_id == match.team2_id
-            )
-
-            # Cache team players as lists to avoid queries in template
-            if match.team1:
-                match.cached_team1_players = list(match.team1.players.all())
-                match.cached_player1 = (
-                    match.cached_team1_players[0] if match.cached_team1_players else None
-                )
-            else:
-                match.cached_team1_players = []
-                match.cached_player1 = None
-
-            if match.team2:
-                match.cached_team2_players = list(match.team2.players.all())
-                match.cached_player2 = (
-                    match.cached_team2_players[0] if match.cached_team2_players else None
-                )
-            else:
-                match.cached_team2_players = []
-                match.cached_player2 = None
+        _attach_team_players(matches)
 
-            # Cache winner players
-            if match.winner:
-                match.cached_winner_players = list(match.winner.players.all())
-            else:
-                match.cached_winner_players = []
-
-            # Cache match_confirmed status to avoid N+1 queries
-            # This replicates the logic from Match.team1_confirmed and Match.team2_confirmed
-            # but uses the already-prefetched data
-            confirmations = list(match.confirmations.all())
-            confirmed_ids = {c.id for c in confirmations}
-
-            # Team 1 confirmation check
-            team1_verified_players = [
-                p for p in match.cached_team1_players
-                if p.user and hasattr(p.user, 'profile') and p.user.profile.email_verified
-            ]
-            team1_ids = {p.id for p in team1_verified_players}
-            team1_all_unverified = len(team1_verified_players) == 0
-            team1_confirmed = (team1_ids.issubset(confirmed_ids)) or team1_all_unverified
-
-            # Team 2 confirmation check
-            team2_verified_players = [
-                p for p in match.cached_team2_players
-                if p.user and hasattr(p.user, 'profile') and p.user.profile.email_verified
-            ]
-            team2_ids = {p.id for p in team2_verified_players}
-            team2_all_unverified = len(team2_verified_players) == 0
-            team2_confirmed = (team2_ids.issubset(confirmed_ids)) or team2_all_unverified
-
-            match.cached_match_confirmed = team1_confirmed and team2_confirmed
-
-        # Add total count for stats display (not just paginated count)
-        context['total_matches'] = self.get_queryset().count()
+        # Add total count for stats display (not just paginated count);
+        # the paginator has already counted the full queryset
+        paginator = context.get('paginator')
+        context['total_matches'] = (
+            paginator.count if paginator else self.get_queryset().count()
+        )
 
         return context
 
@@ -160,16 +152,21 @@ class MatchDetailView(LoginRequiredMixin, DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        match = self.get_object()
-
-        # Get Elo changes for this match
-        elo_changes = match.elo_history.select_related('player').all()
+        match = self.object
+
+        # Get Elo changes for this match, with each player's side resolved
+        # in the same query
+        team_players = Team.players.through.objects.filter(player_id=OuterRef('player_id'))
+        elo_changes = match.elo_history.select_related('player').annotate(
+            on_team1=Exists(team_players.filter(team_id=match.team1_id)),
+            on_team2=Exists(team_players.filter(team_id=match.team2_id)),
+        )
 
         # Pass separate elo changes for easier template access
         for change in elo_changes:
-            if change.player in match.team1.players.all():
+            if change.on_team1:
                 context['player1_elo_change'] = change
-            elif change.player in match.team2.players.all():
+            elif change.on_team2:
                 context['player2_elo_change'] = change
 
         return context
@@ -185,30 +182,39 @@ class PlayerDetailView(LoginRequiredMixin, DetailView):
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
 
-        player = self.get_object()
+        player = self.object
         page = self.request.GET.get('page', 1)
 
         # Try cache for aggregate stats (10 minute TTL)
         stats_cache_key = f'player_stats_{player.pk}'
         cached_stats = cache.get(stats_cache_key)
 
+        # Whether the player is on the winning team, computed in SQL
+        player_won = Exists(
+            Team.objects.filter(pk=OuterRef('winner_id'), players=player)
+        )
+
         if cached_stats is None:
             # Cache miss - fetch and compute stats
-            # Use is_confirmed=True to filter at DB level
+            # Use is_confirmed=True to filter at DB level; only the result
+            # of each match is needed, so nothing else is loaded
             all_matches = Match.objects.filter(
                 Q(team1__players=player) | Q(team2__players=player),
                 is_confirmed=True,
-            ).select_related('team1', 'team2', 'winner').prefetch_related(
-                'team1__players',
-                'team2__players',
+            ).annotate(player_won=player_won).values_list(
+                'id', 'winner_id', 'player_won'
             ).order_by('-date_played').distinct()
 
-            confirmed_matches = list(all_matches)
+            # True for a win, False for a loss, None while undecided
+            outcomes = [
+                won if winner_id is not None else None
+                for _, winner_id, won in all_matches
+            ]
 
-            total_matches = len(confirmed_matches)
-            wins = len([m for m in confirmed_matches if m.winner and player in m.winner.players.all()])
+            total_matches = len(outcomes)
+            streaks = self._calculate_streaks(outcomes)
+            wins = streaks['wins']
             losses = total_matches - wins
-            streaks = self._calculate_streaks(confirmed_matches)
 
             cached_stats = {
                 'total_matches': total_matches,
@@ -229,7 +235,7 @@ class PlayerDetailView(LoginRequiredMixin, DetailView):
         ).select_related('team1', 'team2', 'winner').prefetch_related(
             'team1__players',
             'team2__players',
-        ).order_by('-date_played').distinct()
+        ).annotate(player_won=player_won).order_by('-date_played').distinct()
 
         from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 
@@ -243,20 +249,21 @@ class PlayerDetailView(LoginRequiredMixin, DetailView):
         except EmptyPage:
             confirmed_matches_page = paginator.page(paginator.num_pages)
 
-        # Add p1_score, p2_score, and player_won to each match from player's perspective
-        for match in confirmed_matches_page.object_list:
+        # Evaluate the page once so the template iterates the same objects
+        page_matches = list(confirmed_matches_page.object_list)
+
+        # Add p1_score and p2_score to each match from player's perspective,
+        # using the denormalized score columns rather than counting games
+        for match in page_matches:
             if player in match.team1.players.all():
-                match.p1_score = match.team1_score
-                match.p2_score = match.team2_score
+                match.p1_score = match.team1_score_cache
+                match.p2_score = match.team2_score_cache
             else:
-                match.p1_score = match.team2_score
-                match.p2_score = match.team1_score
-
-            # Check if player won (works for both 1v1 and 2v2)
-            match.player_won = match.winner and player in match.winner.players.all()
+                match.p1_score = match.team2_score_cache
+                match.p2_score = match.team1_score_cache
 
         context.update({
-            'matches': confirmed_matches_page.object_list,
+            'matches': page_matches,
             'page_obj': confirmed_matches_page,
             'is_paginated': paginator.num_pages > 1,
             **cached_stats,
@@ -264,21 +271,21 @@ class PlayerDetailView(LoginRequiredMixin, DetailView):
 
         return context
 
-    def _calculate_streaks(self, matches):
+    def _calculate_streaks(self, outcomes):
         current_streak = streak_type = 0
         longest_win = longest_loss = win_streak = loss_streak = 0
+        wins = 0
 
-        for match in matches:
-            player_won = self.object in match.winner.players.all()
-
-            if player_won:
+        for won in outcomes:
+            if won:
+                wins += 1
                 if streak_type != 'win':
                     longest_loss = max(longest_loss, loss_streak)
                     loss_streak = win_streak = 0
                     streak_type = 'win'
                 win_streak += 1
                 current_streak = win_streak
-            elif match.winner:  # Loss
+            elif won is not None:  # Loss
                 if streak_type != 'loss':
                     longest_win = max(longest_win, win_streak)
                     win_streak = loss_streak = 0
@@ -292,6 +299,7 @@ class PlayerDetailView(LoginRequiredMixin, DetailView):
             longest_loss = max(longest_loss, loss_streak)
 
         return {
+            'wins': wins,
             'current_streak': current_streak,
             'streak_type': streak_type,
             'longest_win_streak': longest_win,
@@ -307,22 +315,35 @@ class DashboardView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
+        # Fetch all dashboard figures from the cache in one round-trip
+        cached = cache.get_many([
+            'dashboard_total_players',
+            'dashboard_total_matches',
+            'dashboard_recent_matches',
+        ])
+
         # Cache total players (15 min TTL)
-        total_players = cache.get('dashboard_total_players')
+        total_players = cached.get('dashboard_total_players')
         if total_players is None:
             total_players = Player.objects.count()
             cache.set('dashboard_total_players', total_players, 900)
 
         # Cache total confirmed matches using denormalized field (10 min TTL)
-        total_matches = cache.get('dashboard_total_matches')
+        total_matches = cached.get('dashboard_total_matches')
         if total_matches is None:
             total_matches = Match.objects.filter(is_confirmed=True).count()
             cache.set('dashboard_total_matches', total_matches, 600)
 
         # Recent matches (5 min TTL)
-        recent_matches = cache.get('dashboard_recent_matches')
+        recent_matches = cached.get('dashboard_recent_matches')
         if recent_matches is None:
-            recent_matches = list(Match.objects.all().order_by("-date_played")[:5])
+            recent_matches = list(
+                Match.objects.select_related(
+                    'team1', 'team2', 'winner'
+                ).prefetch_related(
+                    'team1__players', 'team2__players'
+                ).order_by("-date_played")[:5]
+            )
             cache.set('dashboard_recent_matches', recent_matches, 300)
 
         context.update(
@@ -379,7 +400,7 @@ class GameCreateView(LoginRequiredMixin, CreateView):
         self.match = get_object_or_404(Match, pk=kwargs["match_pk"])
 
         # Check if match is already complete
-        if self.match.winner:
+        if self.match.winner_id is not None:
             messages.warning(
                 request, f"This match is already complete. {self.match.winner} won!"
             )
@@ -387,20 +408,24 @@ class GameCreateView(LoginRequiredMixin, CreateView):
 
         return super().dispatch(request, *args, **kwargs)
 
+    def _next_game_number(self):
+        """Number for the next game in this match, looked up once per request"""
+        if not hasattr(self, "_next_game_number_cache"):
+            last_number = self.match.games.aggregate(mx=Max("game_number"))["mx"]
+            self._next_game_number_cache = (last_number or 0) + 1
+        return self._next_game_number_cache
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["match"] = self.match
-        # Get next game number
-        last_game = self.match.games.order_by("-game_number").first()
-        context["next_game_number"] = (last_game.game_number + 1) if last_game else 1
+        context["next_game_number"] = self._next_game_number()
         return context
 
     def form_valid(self, form):
         form.instance.match = self.match
         # Auto-set game_number if not provided
         if not form.instance.game_number:
-            last_game = self.match.games.order_by("-game_number").first()
-            form.instance.game_number = (last_game.game_number + 1) if last_game else 1
+            form.instance.game_number = self._next_game_number()
 
         # Save the game
         self.object = form.save()
@@ -409,13 +434,14 @@ class GameCreateView(LoginRequiredMixin, CreateView):
             self.request, f"Game {self.object.game_number} added successfully!"
         )
 
-        # Refresh match from database to get updated winner status
-        self.match.refresh_from_db()
+        # Saving the game re-saved self.match, which recomputed the winner
+        # and score cache in place, and the post_save signals updated
+        # is_confirmed on the same instance, so no refresh is needed
 
         # Check if match is now complete
-        if self.match.winner:
+        if self.match.winner_id is not None:
             # Check if it was auto-confirmed by signals.py logic
-            if self.match.match_confirmed:
+            if self.match.is_confirmed:
                 unverified_players = self.match.get_unverified_players()
                 if unverified_players:
                     messages.warning(
@@ -424,7 +450,7 @@ class GameCreateView(LoginRequiredMixin, CreateView):
                     )
             messages.success(
                 self.request,
-                f"🎉 Match Complete! {self.match.winner} wins {self.match.team1_score}-{self.match.team2_score}!", #TODO: "wins", but what if it is a team with 2 names?
+                f"🎉 Match Complete! {self.match.winner} wins {self.match.team1_score_cache}-{self.match.team2_score_cache}!", #TODO: "wins", but what if it is a team with 2 names?
             )
             # Always go to match detail if match is complete, regardless of button pressed
             return redirect("pingpong:match_detail", pk=self.match.pk)
@@ -457,12 +483,13 @@ class MatchCreateView(LoginRequiredMixin, CreateView):
         context = super().get_context_data(**kwargs)
         context["locations"] = Location.objects.all()
 
+        # Players 2-4 offer the same choices, so load them once for all
+        # three selects instead of once per field
+        context["opponent_choices"] = list(context["form"].fields["player2"].queryset)
+
         # Add user permission info for template
         context["is_staff"] = self.request.user.is_staff
-        try:
-            context["user_player"] = self.request.user.player
-        except AttributeError:
-            context["user_player"] = None
+        context["user_player"] = get_user_player(self.request.user)
 
         return context
 
@@ -486,20 +513,12 @@ class MatchCreateView(LoginRequiredMixin, CreateView):
                     "player1"
                 ].help_text = "You are automatically set as Player 1"
 
-                # Limit player2 choices to exclude the user
-                form.fields["player2"].queryset = Player.objects.exclude(
-                    pk=user_player.pk
-                )
-
-                # Limit player3 choices to exclude the user
-                form.fields["player3"].queryset = Player.objects.exclude(
-                    pk=user_player.pk
-                )
-
-                # Limit player4 choices to exclude the user
-                form.fields["player4"].queryset = Player.objects.exclude(
-                    pk=user_player.pk
+                # Limit the other players' choices to exclude the user
+                other_players = Player.objects.exclude(pk=user_player.pk).only(
+                    "id", "name", "nickname", "user"
                 )
+                for field_name in ("player2", "player3", "player4"):
+                    form.fields[field_name].queryset = other_players
 
             except Player.DoesNotExist:
                 # User has no player profile - show error message
@@ -571,53 +590,13 @@ class MatchCreateView(LoginRequiredMixin, CreateView):
                 )
                 return self.form_invalid(form)
 
-        # Create Team objects
-        from .models import Team
-
+        # Create Team objects (or reuse existing)
         if is_double:
-            # Create 2-player teams (or reuse existing)
-            team1 = (Team.objects
-                     .filter(players=player1)
-                     .filter(players=player2)
-                     .first()
-                     )
-            if not team1:
-                team1 = Team.objects.create()
-                team1.players.set([player1, player2])
-                team1.save()
-
-            team2 = (Team.objects
-                     .filter(players=player3)
-                     .filter(players=player4)
-                     .first()
-                     )
-            if not team2:
-                team2 = Team.objects.create()
-                team2.players.set([player3, player4])
-                team2.save()
+            team1 = get_or_create_team(player1, player2)
+            team2 = get_or_create_team(player3, player4)
         else:
-            # Create 1-player teams (or reuse existing)
-            team1 = (Team.objects
-                     .filter(players=player1)
-                     .annotate(num_players=Count('players'))
-                     .filter(num_players=1)
-                     .first()
-                     )
-            if not team1:
-                team1 = Team.objects.create()
-                team1.players.set([player1])
-                team1.save()
-
-            team2 = (Team.objects
-                     .filter(players=player2)
-                     .annotate(num_players=Count('players'))
-                     .filter(num_players=1)
-                     .first()
-                     )
-            if not team2:
-                team2 = Team.objects.create()
-                team2.players.set([player2])
-                team2.save()
+            team1 = get_or_create_team(player1)
+            team2 = get_or_create_team(player2)
 
         # Assign teams to match instance (don't save yet)
         form.instance.team1 = team1
@@ -636,21 +615,21 @@ class MatchUpdateView(LoginRequiredMixin, UpdateView):
 
     def get_form_class(self):
         # If match has a winner, only allow editing location and notes
-        if self.object.winner:
+        if self.object.winner_id is not None:
             return MatchEditForm
         return MatchForm
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["locations"] = Location.objects.all()
-        context["is_complete"] = bool(self.object.winner)
+        context["is_complete"] = self.object.winner_id is not None
         return context
 
     def get_success_url(self):
         return reverse_lazy("pingpong:match_detail", kwargs={"pk": self.object.pk})
 
     def form_valid(self, form):
-        if self.object.winner:
+        if self.object.winner_id is not None:
             messages.success(self.request, "Match details updated successfully!")
         else:
             messages.success(self.request, "Match updated successfully!")
@@ -732,94 +711,81 @@ class LeaderboardView(LoginRequiredMixin, TemplateView):
                 date_played__lte=filter_end_date
             )
 
-        # Prefetch only what we need for stats
-        matches_query = matches_query.select_related(
-            'team1', 'team2', 'winner'
-        ).prefetch_related(
-            'team1__players',
-            'team2__players',
-            'winner__players',
-            'games'
+        # Games per match as a correlated subquery, so joining the team
+        # players below does not multiply the count
+        num_games = Subquery(
+            Game._base_manager.filter(match=OuterRef('pk'))
+            .values('match')
+            .annotate(count=Count('pk'))
+            .values('count')
         )
 
-        # Load all confirmed matches once into memory
-        confirmed_matches = list(matches_query)
-
-        # Build a lookup dictionary: player_id -> list of their matches
-        # This avoids N+1 queries
-        player_matches = {}
-        for match in confirmed_matches:
-            # Get players from team1
-            for player in match.team1.players.all():
-                if player.id not in player_matches:
-                    player_matches[player.id] = []
-                player_matches[player.id].append(match)
-
-            # Get players from team2
-            for player in match.team2.players.all():
-                if player.id not in player_matches:
-                    player_matches[player.id] = []
-                player_matches[player.id].append(match)
-
-        # Pre-cache game counts for all matches to avoid repeated queries
-        match_game_counts = {}
-        for match in confirmed_matches:
-            # Games are already prefetched, so this uses cached data
-            match_game_counts[match.id] = len(match.games.all())
-
-        # Get only players that have matches (optimization)
-        player_ids_with_matches = set(player_matches.keys())
-        player_stats_qs = Player.objects.filter(
-            id__in=player_ids_with_matches
-        ).select_related('user')
+        # Tally matches, wins and games per player in SQL, with one grouped
+        # query for each side of the match
+        player_totals = {}
+        for side in ('team1', 'team2'):
+            side_totals = matches_query.values(
+                player_id=F(f'{side}__players')
+            ).annotate(
+                total_matches=Count('pk'),
+                wins=Count('pk', filter=Q(winner=F(side))),
+                total_games=Coalesce(Sum(num_games), 0),
+            ).order_by()
+            for row in side_totals:
+                totals = player_totals.setdefault(
+                    row["player_id"], {"total_matches": 0, "wins": 0, "total_games": 0}
+                )
+                totals["total_matches"] += row["total_matches"]
+                totals["wins"] += row["wins"]
+                totals["total_games"] += row["total_games"]
+
+        # Get only players that have matches (optimization), as plain rows
+        # with just the columns the leaderboard renders; the results are
+        # cached, so no model instances are built or pickled
+        player_rows = Player.objects.filter(
+            id__in=player_totals.keys()
+        ).values('id', 'name', 'nickname', 'playing_style', 'elo_rating', 'elo_peak')
+        style_labels = dict(Player._meta.get_field('playing_style').flatchoices)
 
-        # Calculate stats in Python using pre-loaded data
         player_stats = []
-        for player in player_stats_qs:
-            # Get matches for this player from our lookup dict
-            player_match_list = player_matches.get(player.id, [])
-
-            if not player_match_list:
-                continue
-
-            total_matches = len(player_match_list)
-
-            # Calculate wins using cached data
-            wins = 0
-            for match in player_match_list:
-                # winner.players is already prefetched
-                if match.winner and player in match.winner.players.all():
-                    wins += 1
-
-            losses = total_matches - wins
-            win_rate = (wins / total_matches * 100) if total_matches > 0 else 0
-
-            # Use pre-cached game counts
-            total_games = sum(match_game_counts.get(m.id, 0) for m in player_match_list)
+        for player in player_rows:
+            totals = player_totals[player["id"]]
+            total_matches = totals["total_matches"]
+            wins = totals["wins"]
 
             player_stats.append({
-                "player": player,
+                "player": {
+                    "pk": player["id"],
+                    "name": player["name"],
+                    "display_name": player["nickname"] or player["name"],
+                    "playing_style": player["playing_style"],
+                    "playing_style_display": style_labels.get(
+                        player["playing_style"], player["playing_style"]
+                    ),
+                },
                 "total_matches": total_matches,
-                "total_games": total_games,
+                "total_games": totals["total_games"],
                 "wins": wins,
-                "losses": losses,
-                "win_rate": win_rate,
-                "elo_rating": player.elo_rating,
-                "elo_peak": player.elo_peak,
+                "losses": total_matches - wins,
+                "win_rate": (wins / total_matches * 100) if total_matches > 0 else 0,
+                "elo_rating": player["elo_rating"],
+                "elo_peak": player["elo_peak"],
             })
 
-        # Sort by Elo rating (desc), then by total wins (desc), then by win rate (desc)
-        player_stats.sort(
-            key=lambda x: (x["elo_rating"], x["wins"], x["win_rate"]), reverse=True
-        )
+        # Rank by Elo rating (desc), then by total wins (desc), then by win rate (desc)
+        def rank_key(x):
+            return (x["elo_rating"], x["wins"], x["win_rate"])
 
-        # Apply top X filter
+        # Apply top X filter; only the top X need to be ordered
         try:
             top_x_int = int(top_x)
-            if top_x_int > 0:
-                player_stats = player_stats[:top_x_int]
         except (ValueError, TypeError):
-            player_stats = player_stats[:10]
+            top_x_int = 10
+
+        if top_x_int > 0:
+            player_stats = heapq.nlargest(top_x_int, player_stats, key=rank_key)
+        else:
+            player_stats.sort(key=rank_key, reverse=True)
 
         # Cache for 10 minutes
         cache.set(cache_key, player_stats, 600)
@@ -870,10 +836,18 @@ class HeadToHeadStatsView(LoginRequiredMixin, TemplateView):
 
             # Get all confirmed 1v1 matches between these players
             # Use is_confirmed=True for DB-level filtering
+            team_players = Player.objects.only("id", "name", "nickname")
             all_matches = (
                 Match.objects.annotate(
                     team1_player_count=Count('team1__players', distinct=True),
-                    team2_player_count=Count('team2__players', distinct=True)
+                    team2_player_count=Count('team2__players', distinct=True),
+                    # Orientation flags from player1's point of view
+                    team1_is_p1=Exists(
+                        Team.objects.filter(pk=OuterRef('team1_id'), players=player1)
+                    ),
+                    winner_is_p1=Exists(
+                        Team.objects.filter(pk=OuterRef('winner_id'), players=player1)
+                    ),
                 )
                 .filter(
                     team1_player_count=1,
@@ -886,9 +860,10 @@ class HeadToHeadStatsView(LoginRequiredMixin, TemplateView):
                 )
                 .select_related("team1", "team2", "winner")
                 .prefetch_related(
-                    "games",
-                    "team1__players",
-                    "team2__players",
+                    # Only names are rendered for the cached match list
+                    Prefetch("team1__players", queryset=team_players),
+                    Prefetch("team2__players", queryset=team_players),
+                    Prefetch("winner__players", queryset=team_players),
                 )
                 .distinct()
                 .order_by("date_played")
@@ -897,147 +872,109 @@ class HeadToHeadStatsView(LoginRequiredMixin, TemplateView):
             matches = list(all_matches)
 
             if matches:
-                # Basic stats (matches is now a list, not QuerySet)
+                # Basic stats (matches is now a list, not QuerySet).
+                # winner_is_p1 comes from SQL; in a 1v1 any other winner is player2
                 total_matches = len(matches)
-                player1_match_wins = len([
-                    m for m in matches
-                    if m.winner and player1 in m.winner.players.all()
-                ])
-                player2_match_wins = len([
-                    m for m in matches
-                    if m.winner and player2 in m.winner.players.all()
-                ])
-
-                # Game-level analysis
-                all_games = []
-                point_differences = []  # For the chart like yours
-                player1_game_wins = 0
-                player2_game_wins = 0
-                close_games = 0  # Decided by 2 points or less
-                player1_dominant = 0  # Won by 5+ points
-                player2_dominant = 0
-
-                for match in matches:
-                    games = match.games.all()
-                    for game in games:
-                        # Determine scores based on who was player1 in the match
-                        if match.team1.players.first() == player1:
-                            p1_score = game.team1_score
-                            p2_score = game.team2_score
-                        else:
-                            p1_score = game.team2_score
-                            p2_score = game.team1_score
-
-                        diff = p1_score - p2_score
-                        point_differences.append(
-                            {
-                                "game_number": len(all_games) + 1,
-                                "difference": diff,
-                                "match_date": match.date_played,
-                                "p1_score": p1_score,
-                                "p2_score": p2_score,
-                            }
-                        )
-
-                        all_games.append(
-                            {
-                                "p1_score": p1_score,
-                                "p2_score": p2_score,
-                                "difference": abs(diff),
-                                "winner": player1 if diff > 0 else player2,
-                            }
-                        )
-
-                        # Count wins
-                        if diff > 0:
-                            player1_game_wins += 1
-                        else:
-                            player2_game_wins += 1
-
-                        # Close games
-                        if abs(diff) <= 2:
-                            close_games += 1
-
-                        # Dominant games
-                        if diff >= 5:
-                            player1_dominant += 1
-                        elif diff <= -5:
-                            player2_dominant += 1
-
-                total_games = len(all_games)
-
-                # Calculate averages
-                avg_point_diff = (
-                    sum(g["difference"] for g in all_games) / total_games
-                    if total_games > 0
-                    else 0
+                player1_match_wins = sum(1 for m in matches if m.winner_is_p1)
+                player2_match_wins = sum(
+                    1 for m in matches if m.winner_id and not m.winner_is_p1
                 )
 
-                # Max margins
-                player1_max_margin = max(
-                    [g["difference"] for g in all_games if g["winner"] == player1],
-                    default=0,
-                )
-                player2_max_margin = max(
-                    [g["difference"] for g in all_games if g["winner"] == player2],
-                    default=0,
-                )
-
-                # Average scores
-                avg_p1_score = (
-                    sum(g["p1_score"] for g in all_games) / total_games
-                    if total_games > 0
-                    else 0
-                )
-                avg_p2_score = (
-                    sum(g["p2_score"] for g in all_games) / total_games
-                    if total_games > 0
-                    else 0
+                # Game-level aggregates, computed in a single query with
+                # scores oriented from player1's point of view
+                games_qs = Game._base_manager.filter(match__in=matches).annotate(
+                    p1_is_team1=Exists(
+                        Team.objects.filter(pk=OuterRef('match__team1_id'), players=player1)
+                    ),
+                ).annotate(
+                    p1_points=Case(
+                        When(p1_is_team1=True, then=F('team1_score')),
+                        default=F('team2_score'),
+                    ),
+                    p2_points=Case(
+                        When(p1_is_team1=True, then=F('team2_score')),
+                        default=F('team1_score'),
+                    ),
+                ).annotate(
+                    diff=F('p1_points') - F('p2_points'),
+                    abs_diff=Abs(F('p1_points') - F('p2_points')),
                 )
-
-                # Recent form (last 5 matches) - matches is already ordered by date_played
-                recent_matches = list(reversed(matches[-5:]))  # Get last 5 and reverse for desc order
-                player1_recent_wins = sum(
-                    1 for m in recent_matches
-                    if m.winner and player1 in m.winner.players.all()
+                game_stats = games_qs.aggregate(
+                    total_games=Count('id'),
+                    player1_game_wins=Count('id', filter=Q(diff__gt=0)),
+                    player2_game_wins=Count('id', filter=Q(diff__lte=0)),
+                    close_games=Count('id', filter=Q(abs_diff__lte=2)),  # Decided by 2 points or less
+                    player1_dominant=Count('id', filter=Q(diff__gte=5)),  # Won by 5+ points
+                    player2_dominant=Count('id', filter=Q(diff__lte=-5)),
+                    avg_point_diff=Avg('abs_diff'),
+                    player1_max_margin=Max('abs_diff', filter=Q(diff__gt=0)),
+                    player2_max_margin=Max('abs_diff', filter=Q(diff__lte=0)),
+                    avg_p1_score=Avg('p1_points'),
+                    avg_p2_score=Avg('p2_points'),
                 )
+                total_games = game_stats['total_games']
+                player1_game_wins = game_stats['player1_game_wins']
+                player2_game_wins = game_stats['player2_game_wins']
+                close_games = game_stats['close_games']
+                player1_dominant = game_stats['player1_dominant']
+                player2_dominant = game_stats['player2_dominant']
+                avg_point_diff = game_stats['avg_point_diff'] or 0
+                player1_max_margin = game_stats['player1_max_margin'] or 0
+                player2_max_margin = game_stats['player2_max_margin'] or 0
+                avg_p1_score = game_stats['avg_p1_score'] or 0
+                avg_p2_score = game_stats['avg_p2_score'] or 0
+
+                # Per-game point differences for the chart
+                # (scores already oriented in SQL, fetched in one query)
+                game_rows = games_qs.order_by(
+                    'match__date_played', 'match_id', 'game_number'
+                ).values_list('p1_points', 'p2_points', 'match__date_played')
+                point_differences = [
+                    {
+                        "game_number": number,
+                        "difference": p1_score - p2_score,
+                        "match_date": date_played.isoformat(),
+                        "p1_score": p1_score,
+                        "p2_score": p2_score,
+                    }
+                    for number, (p1_score, p2_score, date_played) in enumerate(game_rows, 1)
+                ]
+
+                # Newest first, reversed once and shared by the recent form
+                # and the match list
+                matches_desc = matches[::-1]
+
+                # Recent form (last 5 matches)
+                recent_matches = matches_desc[:5]
+                # winner_is_p1 comes from SQL; in a 1v1 any other winner is player2
+                player1_recent_wins = sum(1 for m in recent_matches if m.winner_is_p1)
                 player2_recent_wins = sum(
-                    1 for m in recent_matches
-                    if m.winner and player2 in m.winner.players.all()
+                    1 for m in recent_matches if m.winner_id and not m.winner_is_p1
                 )
 
-                # Match margins (for average margin per match chart)
-                match_margins = []
-                for match in matches:
-                    if match.winner.players.first() == player1:
-                        margin = (
-                            match.team1_score - match.team2_score
-                            if match.team1.players.first() == player1
-                            else match.team2_score - match.team1_score
-                        )
-                    elif match.winner.players.first() == player2:
-                        margin = -(
-                            match.team1_score - match.team2_score
-                            if match.team1.players.first() == player1
-                            else match.team2_score - match.team1_score
-                        )
-                    else:
-                        margin = 0
-
-                    match_margins.append(
-                        {
-                            "match_number": len(match_margins) + 1,
-                            "margin": margin,
-                            "date": match.date_played,
-                        }
-                    )
+                # Match margins (for average margin per match chart): games
+                # won by the winner minus games won by the loser, read from
+                # the denormalized score columns rather than counting games
+                match_margins = [
+                    {
+                        "match_number": number,
+                        "margin": (
+                            abs(match.team1_score_cache - match.team2_score_cache)
+                            if match.winner_id is not None
+                            else 0
+                        ),
+                        "date": match.date_played.isoformat(),
+                    }
+                    for number, match in enumerate(matches, 1)
+                ]
 
                 # Calculate average margin per match
-                cumulative_avg = []
-                running_total = 0
-                for i, m in enumerate(match_margins, 1):
-                    running_total += m["margin"]
-                    cumulative_avg.append(running_total / i)
+                cumulative_avg = [
+                    total / i
+                    for i, total in enumerate(
+                        accumulate(m["margin"] for m in match_margins), 1
+                    )
+                ]
 
                 h2h_data = {
                     "player1": player1,
@@ -1077,14 +1014,12 @@ class HeadToHeadStatsView(LoginRequiredMixin, TemplateView):
                     "player1_recent_wins": player1_recent_wins,
                     "player2_recent_wins": player2_recent_wins,
                     "recent_total": min(5, total_matches),
-                    "point_differences_json": json.dumps(
-                        point_differences, cls=DjangoJSONEncoder
-                    ),
-                    "match_margins_json": json.dumps(
-                        match_margins, cls=DjangoJSONEncoder
-                    ),
+                    # Dates are stored as ISO strings above, so the stdlib
+                    # encoder is enough here
+                    "point_differences_json": json.dumps(point_differences),
+                    "match_margins_json": json.dumps(match_margins),
                     "cumulative_avg_json": json.dumps(cumulative_avg),
-                    "matches": list(reversed(matches)),
+                    "matches": matches_desc,
                 }
 
                 # Cache for 30 minutes
@@ -1127,19 +1062,22 @@ class PlayerRegistrationView(CreateView):
         """Log the user in after successful registration"""
         response = super().form_valid(form)
         user = self.object  # type: ignore
-        verification_url = self.request.build_absolute_uri(
-            reverse_lazy(
-                "pingpong:email_verify", args=[user.profile.email_verification_token]
-            )
+        verification_url = site_url(
+            reverse("pingpong:email_verify", args=[user.profile.email_verification_token])
         )
 
-        send_mail(
+        sent = send_mail_in_background(
             subject="Verify your email address",
             message=f"Welcome {user.username}! Click here to verify your email: {verification_url}",
-            from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[user.email],
-            fail_silently=False,
         )
+        # False only when an inline send failed; None means it was queued
+        if sent is False:
+            messages.error(
+                self.request,
+                "Your account was created, but we couldn't send the verification email. "
+                "Please contact an administrator to have it resent.",
+            )
 
         return render(
             self.request,
@@ -1147,6 +1085,7 @@ class PlayerRegistrationView(CreateView):
             {
                 "email": user.email,
                 "username": user.username,
+                "email_failed": sent is False,
             },
         )
 
@@ -1161,24 +1100,27 @@ def match_confirm(request, pk):
     """Allow a player to confirm a match"""
     match = get_object_or_404(Match, pk=pk)
 
-    try:
-        user_player = Player.objects.get(user=request.user)
+    user_player = get_user_player(request.user)
+    if user_player is None:
+        messages.error(request, "You must have a player profile to confirm matches.")
+        return redirect("pingpong:match_detail", pk=pk)
 
-        # Verify the player belongs to one of the two teams
-        if (user_player not in match.team1.players.all() and
-                user_player not in match.team2.players.all()):
-            messages.error(request, "You are not a player in this match.")
-            return redirect("pingpong:match_detail", pk=pk)
+    # Verify the player belongs to one of the two teams; the team/player
+    # link table alone answers this, without joining the teams
+    is_participant = Team.players.through.objects.filter(
+        team_id__in=[match.team1_id, match.team2_id], player_id=user_player.pk
+    ).exists()
+    if not is_participant:
+        messages.error(request, "You are not a player in this match.")
+        return redirect("pingpong:match_detail", pk=pk)
 
-        # Create confirmations (does not duplicate existing ones)
-        MatchConfirmation.objects.get_or_create(
-            match=match,
-            player=user_player
-        )
+    # Create confirmations (does not duplicate existing ones)
+    MatchConfirmation.objects.get_or_create(
+        match=match,
+        player=user_player
+    )
 
-        messages.success(request, "You have confirmed this match!")
-    except Player.DoesNotExist:
-        messages.error(request, "You must have a player profile to confirm matches.")
+    messages.success(request, "You have confirmed this match!")
 
     return redirect("pingpong:match_detail", pk=pk)
 
@@ -1188,7 +1130,10 @@ class EmailVerifyView(View):
 
     def get(self, request, token):
         try:
-            profile = UserProfile.objects.get(email_verification_token=token)
+            # Indexed token lookup; the user is needed for login below
+            profile = UserProfile.objects.select_related("user").get(
+                email_verification_token=token
+            )
 
             # Check if already verified
             if profile.email_verified:
@@ -1242,29 +1187,26 @@ class EmailResendVerificationView(LoginRequiredMixin, View):
             token = profile.create_verification_token()
             profile.save()
 
-            verification_url = request.build_absolute_uri(
-                f"/pingpong/verify-email/{token}/"
-            )
+            verification_url = site_url(reverse("pingpong:email_verify", args=[token]))
 
-            try:
-                send_mail(
-                    subject="Verify your email address",
-                    message=f"Welcome {user.username}! Click here to verify your email: {verification_url}",
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[user.email],
-                    fail_silently=False,
-                )
+            sent = send_mail_in_background(
+                subject="Verify your email address",
+                message=f"Welcome {user.username}! Click here to verify your email: {verification_url}",
+                recipient_list=[user.email],
+            )
+            # False only when an inline send failed; None means it was queued
+            if sent is False:
+                messages.error(request, "Failed to send verification email. Please try again later.")
+            else:
                 messages.success(
                     request,
                     f"Verification email sent! Check your inbox at {request.user.email}",
                 )
-            except Exception as e:
-                logger.error(f"Failed to send verification email to {user.email}: {e}")
-                messages.error(request, "Failed to send verification email. Please try again later.")
 
         # Redirect to player profile if exists, otherwise dashboard
-        if hasattr(request.user, "player"):
-            return redirect("pingpong:player_detail", pk=request.user.player.pk)
+        user_player = get_user_player(request.user)
+        if user_player:
+            return redirect("pingpong:player_detail", pk=user_player.pk)
         return redirect("pingpong:dashboard")
 
 
@@ -1280,10 +1222,7 @@ class ScheduledMatchCreateView(LoginRequiredMixin, CreateView):
         context = super().get_context_data(**kwargs)
         context["locations"] = Location.objects.all()
         context["is_staff"] = self.request.user.is_staff
-        try:
-            context["user_player"] = self.request.user.player
-        except AttributeError:
-            context["user_player"] = None
+        context["user_player"] = get_user_player(self.request.user)
         return context
 
     def get_form(self, form_class=None):
@@ -1303,10 +1242,11 @@ class ScheduledMatchCreateView(LoginRequiredMixin, CreateView):
                 )
                 form.fields["player1"].help_text = "You are automatically set as Player 1"
 
-                # Limit player2 choices to exclude the user
+                # Limit player2 choices to exclude the user; the select only
+                # renders names, and the chosen player's user is emailed later
                 form.fields["player2"].queryset = Player.objects.exclude(
                     pk=user_player.pk
-                )
+                ).only("id", "name", "nickname", "user")
 
             except Player.DoesNotExist:
                 messages.error(
@@ -1357,59 +1297,63 @@ class ScheduledMatchCreateView(LoginRequiredMixin, CreateView):
                 return self.form_invalid(form)
 
         # Create 1-player teams (scheduled matches are singles only for now)
-        from .models import Team
-
-        if True:  # Scheduled matches are singles-only
-            # Create 1-player teams (or reuse existing)
-            team1 = (Team.objects
-                     .filter(players=player1)
-                     .annotate(num_players=Count('players'))
-                     .filter(num_players=1)
-                     .first()
-                     )
-            if not team1:
-                team1 = Team.objects.create()
-                team1.players.set([player1])
-                team1.save()
-
-            team2 = (Team.objects
-                     .filter(players=player2)
-                     .annotate(num_players=Count('players'))
-                     .filter(num_players=1)
-                     .first()
-                     )
-            if not team2:
-                team2 = Team.objects.create()
-                team2.players.set([player2])
-                team2.save()
+        team1 = get_or_create_team(player1)
+        team2 = get_or_create_team(player2)
 
         # Assign teams to scheduled match
         form.instance.team1 = team1
         form.instance.team2 = team2
 
+        # Notifications are queued right after the insert, so record them
+        # as sent up front rather than issuing a follow-up UPDATE
+        form.instance.notification_sent = True
+
         # Save the scheduled match
         self.object = form.save()
         scheduled_match = self.object
 
         # Send notification emails to both players
-        send_scheduled_match_email(scheduled_match, player1)
-        send_scheduled_match_email(scheduled_match, player2)
-
-        # Mark notification as sent
-        scheduled_match.notification_sent = True
-        scheduled_match.save()
+        send_scheduled_match_emails(scheduled_match, [player1, player2])
 
         messages.success(
             self.request,
-            f"Match scheduled for {scheduled_match.scheduled_date.strftime('%B %d, %Y')}! Notifications sent to both players.",
+            f"Match scheduled for {date_format(scheduled_match.scheduled_date, 'F d, Y')}! Notifications sent to both players.",
         )
 
         # Redirect to calendar showing the month of the scheduled match
         return redirect(
-            f"{reverse_lazy('pingpong:calendar')}?year={scheduled_match.scheduled_date.year}&month={scheduled_match.scheduled_date.month}"
+            f"{reverse('pingpong:calendar')}?year={scheduled_match.scheduled_date.year}&month={scheduled_match.scheduled_date.month}"
         )
 
 
+def _calendar_entry(match, is_scheduled):
+    """Plain snapshot of what the calendar grid shows for a (scheduled) match, safe to cache"""
+    player1, player2 = match.player1, match.player2
+    return SimpleNamespace(
+        pk=match.pk,
+        is_scheduled=is_scheduled,
+        # Scheduled matches have no is_double field and are shown as singles
+        is_double=getattr(match, "is_double", False),
+        team1_name=match.team1.name,
+        team2_name=match.team2.name,
+        team1_player_names=[p.name for p in match.team1.players.all()],
+        team2_player_names=[p.name for p in match.team2.players.all()],
+        player1=str(player1) if player1 else "",
+        player2=str(player2) if player2 else "",
+        player1_name=player1.name if player1 else "",
+        player2_name=player2.name if player2 else "",
+    )
+
+
+@lru_cache(maxsize=256)
+def _month_grid(year, month):
+    """Return the Sunday-first weeks of dates for a month (never changes)"""
+    return tuple(
+        tuple(week)
+        for week in calendar.Calendar(firstweekday=6).monthdatescalendar(year, month)
+    )
+
+
 class CalendarView(LoginRequiredMixin, TemplateView):
     """Display calendar view of scheduled and past matches"""
 
@@ -1418,8 +1362,7 @@ class CalendarView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         from django.utils import timezone
-        import calendar
-        from datetime import date
+        from datetime import date, datetime, time
 
         # Get month/year from query params or use current
         today = timezone.now().date()
@@ -1441,70 +1384,89 @@ class CalendarView(LoginRequiredMixin, TemplateView):
             next_month = date(year, month + 1, 1)
 
         # Get user's player
-        try:
-            user_player = self.request.user.player
-        except AttributeError:
-            user_player = None
-
-        # Get scheduled matches for this month (with match data for filtering)
-        scheduled_matches = ScheduledMatch.objects.filter(
-            scheduled_date__year=year,
-            scheduled_date__month=month,
-        ).select_related('match', 'match__team1', 'match__team2').prefetch_related(
-            'match__confirmations'
-        ).order_by("scheduled_date", "scheduled_time")
-
-        # Get completed matches for this month
-        # Exclude matches with related_name to scheduled match for prefetching
-        completed_matches = Match.objects.filter(
-            date_played__year=year,
-            date_played__month=month,
-        ).select_related('scheduled_from').order_by("date_played")
-
-        # Organize matches by day
-        matches_by_day = {}
-        for sm in scheduled_matches:
-            # Skip fully confirmed scheduled matches
-            if sm.match and sm.match.match_confirmed:
-                continue
-
-            day = sm.scheduled_date.day
-            if day not in matches_by_day:
-                matches_by_day[day] = []
-            sm.is_scheduled = True
-            matches_by_day[day].append(sm)
-
-        for m in completed_matches:
-            # Skip matches that came from scheduled matches and aren't fully confirmed
-            # (they're already shown as scheduled matches above)
-            if not m.match_confirmed:
-                continue
-
-            day = m.date_played.day
-            if day not in matches_by_day:
-                matches_by_day[day] = []
-            m.is_scheduled = False
-            matches_by_day[day].append(m)
-
-        # Build calendar weeks structure for the template
-        cal = calendar.Calendar(firstweekday=6)  # Sunday first
-        calendar_weeks = []
-        for week in cal.monthdatescalendar(year, month):
-            week_data = []
-            for day_date in week:
-                day_matches = matches_by_day.get(day_date.day, []) if day_date.month == month else []
-                week_data.append({
-                    'day': day_date.day,
-                    'date': day_date,
-                    'is_other_month': day_date.month != month,
-                    'is_today': day_date == today,
-                    'matches': day_matches,
-                })
-            calendar_weeks.append(week_data)
+        user_player = get_user_player(self.request.user)
+
+        # Only load the columns the calendar template renders
+        team_players = Player.objects.only("id", "name", "nickname")
+        players_prefetch = (
+            Prefetch("team1__players", queryset=team_players),
+            Prefetch("team2__players", queryset=team_players),
+        )
+        scheduled_fields = (
+            "scheduled_date", "scheduled_time", "team1__name", "team2__name", "location__name",
+        )
+
+        # Try cache first (5 minute TTL). Keyed per user because the match
+        # managers only return rows the current user may see.
+        generation = cache.get('calendar_generation', 0)
+        calendar_cache_key = (
+            f'calendar_{generation}_{self.request.user.pk}_{year}_{month}_{today}'
+        )
+        calendar_weeks = cache.get(calendar_cache_key)
+
+        if calendar_weeks is None:
+            # Get scheduled matches for this month, skipping fully confirmed
+            # ones (those are shown as completed matches below). Half-open
+            # month ranges (rather than __year/__month) let the date columns'
+            # indexes be used.
+            scheduled_matches = ScheduledMatch.objects.filter(
+                scheduled_date__gte=current_date,
+                scheduled_date__lt=next_month,
+            ).exclude(match__is_confirmed=True).select_related(
+                'team1', 'team2', 'location'
+            ).only(*scheduled_fields).prefetch_related(
+                *players_prefetch
+            ).order_by("scheduled_date", "scheduled_time")
+
+            # Get confirmed matches for this month; unconfirmed ones are already
+            # shown as scheduled matches above
+            completed_matches = Match.objects.filter(
+                date_played__gte=timezone.make_aware(datetime.combine(current_date, time.min)),
+                date_played__lt=timezone.make_aware(datetime.combine(next_month, time.min)),
+                is_confirmed=True,
+            ).select_related('team1', 'team2').only(
+                "is_double", "date_played", "team1__name", "team2__name",
+            ).prefetch_related(
+                *players_prefetch
+            ).order_by("date_played")
+
+            # Organize matches by date; only this month's dates get entries,
+            # so days from the neighbouring months stay empty
+            matches_by_day = defaultdict(list)
+            for sm in scheduled_matches:
+                matches_by_day[sm.scheduled_date].append(_calendar_entry(sm, is_scheduled=True))
+
+            for m in completed_matches:
+                matches_by_day[timezone.localtime(m.date_played).date()].append(
+                    _calendar_entry(m, is_scheduled=False)
+                )
+
+            # Build calendar weeks structure for the template; days without
+            # matches share one empty tuple
+            no_matches = ()
+            calendar_weeks = [
+                [
+                    {
+                        'day': day_date.day,
+                        'date': day_date,
+                        'is_other_month': day_date.month != month,
+                        'is_today': day_date == today,
+                        'matches': matches_by_day.get(day_date, no_matches),
+                    }
+                    for day_date in week
+                ]
+                for week in _month_grid(year, month)
+            ]
+
+            cache.set(calendar_cache_key, calendar_weeks, 300)
 
         # Get upcoming scheduled matches (all future)
         upcoming_matches = ScheduledMatch.objects.filter(
             scheduled_date__gte=today
+        ).select_related('team1', 'team2', 'location').only(
+            *scheduled_fields
+        ).prefetch_related(
+            *players_prefetch
         ).order_by("scheduled_date", "scheduled_time")[:5]
 
         context.update(
@@ -1665,53 +1627,11 @@ class ScheduledMatchConvertView(LoginRequiredMixin, CreateView):
 
         # Create or reuse Team objects (same logic as MatchCreateView)
         if is_double:
-            # Create 2-player teams
-            team1 = (Team.objects
-                     .filter(players=player1)
-                     .filter(players=player3)
-                     .annotate(num_players=Count('players'))
-                     .filter(num_players=2)
-                     .first()
-                     )
-            if not team1:
-                team1 = Team.objects.create()
-                team1.players.set([player1, player3])
-                team1.save()
-
-            team2 = (Team.objects
-                     .filter(players=player2)
-                     .filter(players=player4)
-                     .annotate(num_players=Count('players'))
-                     .filter(num_players=2)
-                     .first()
-                     )
-            if not team2:
-                team2 = Team.objects.create()
-                team2.players.set([player2, player4])
-                team2.save()
+            team1 = get_or_create_team(player1, player3)
+            team2 = get_or_create_team(player2, player4)
         else:
-            # Create 1-player teams
-            team1 = (Team.objects
-                     .filter(players=player1)
-                     .annotate(num_players=Count('players'))
-                     .filter(num_players=1)
-                     .first()
-                     )
-            if not team1:
-                team1 = Team.objects.create()
-                team1.players.set([player1])
-                team1.save()
-
-            team2 = (Team.objects
-                     .filter(players=player2)
-                     .annotate(num_players=Count('players'))
-                     .filter(num_players=1)
-                     .first()
-                     )
-            if not team2:
-                team2 = Team.objects.create()
-                team2.players.set([player2])
-                team2.save()
+            team1 = get_or_create_team(player1)
+            team2 = get_or_create_team(player2)
 
         # Assign teams to match
         form.instance.team1 = team1
@@ -1771,7 +1691,10 @@ class PasskeyManagementView(LoginRequiredMixin, View):
             messages.error(request, "Passkey functionality is not available.")
             return redirect("pingpong:dashboard")
 
-        credentials = WebAuthnCredential.objects.filter(user=request.user)
+        # Skip the key material; the page only lists names and dates
+        credentials = WebAuthnCredential.objects.filter(user=request.user).only(
+            "id", "name", "created_at"
+        ).order_by("-created_at")
         return render(request, self.template_name, {
             'credentials': credentials
         })
@@ -1781,12 +1704,19 @@ class PasskeyManagementView(LoginRequiredMixin, View):
             messages.error(request, "Passkey functionality is not available.")
             return redirect("pingpong:dashboard")
 
-        credential_id = request.POST.get('credential_id')
-        credential = get_object_or_404(
-            WebAuthnCredential,
+        try:
+            credential_id = int(request.POST.get('credential_id', ''))
+        except ValueError:
+            messages.error(request, "Invalid passkey id.")
+            return redirect('pingpong:passkey_management')
+
+        # Only the name is needed before deleting; skip the key material
+        credential = WebAuthnCredential.objects.filter(
             pk=credential_id,
             user=request.user
-        )
+        ).only("id", "name").first()
+        if credential is None:
+            raise Http404("No passkey matches the given query.")
 
         # Send notification email before deleting
         device_name = credential.name
@@ -1839,7 +1769,7 @@ class TeamDetailView(LoginRequiredMixin, DetailView):
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
 
-        team = self.get_object()
+        team = self.object
 
         # Fetch confirmed matches for team using DB-level filtering
         confirmed_matches = list(Match.objects.filter(
@@ -1848,28 +1778,27 @@ class TeamDetailView(LoginRequiredMixin, DetailView):
         ).select_related('team1', 'team2', 'winner').prefetch_related(
             'team1__players',
             'team2__players',
-            'games'
         ).order_by('-date_played').distinct())
 
         # Add custom attributes to each match from team's perspective
         for match in confirmed_matches:
             # Determine if team is team1 or team2
-            is_team1 = match.team1 == team
+            is_team1 = match.team1_id == team.pk
 
             # Set opponent team
             match.opponent_team = match.team2 if is_team1 else match.team1
 
-            # Set scores from team's perspective
-            match.team_score = match.team1_score if is_team1 else match.team2_score
-            match.opponent_score = match.team2_score if is_team1 else match.team1_score
+            # Set scores from team's perspective (denormalized columns)
+            match.team_score = match.team1_score_cache if is_team1 else match.team2_score_cache
+            match.opponent_score = match.team2_score_cache if is_team1 else match.team1_score_cache
 
             # Check if team won
-            match.team_won = match.winner == team
+            match.team_won = match.winner_id == team.pk
 
         total_matches = len(confirmed_matches)
 
         # Won matches and losses
-        wins = len([m for m in confirmed_matches if m.winner == team])
+        wins = len([m for m in confirmed_matches if m.winner_id == team.pk])
         losses = total_matches - wins
 
         # Calculate streaks
@@ -1907,7 +1836,7 @@ class TeamDetailView(LoginRequiredMixin, DetailView):
 
         # Iterate through matches from most recent to oldest
         for match in matches:
-            team_won = match.winner == team
+            team_won = match.winner_id == team.pk
 
             if team_won:
                 if streak_type != 'win':
@@ -1918,7 +1847,7 @@ class TeamDetailView(LoginRequiredMixin, DetailView):
                     streak_type = 'win'
                 win_streak += 1
                 current_streak = win_streak
-            elif match.winner:  # Loss (match has a winner but it's not this team)
+            elif match.winner_id is not None:  # Loss (match has a winner but it's not this team)
                 if streak_type != 'loss':
                     # Switching from win to loss or starting fresh
                     longest_win = max(longest_win, win_streak)
@@ -1,22 +1,24 @@
 import time
-from threading import local
+from contextvars import ContextVar
 
 from django.conf import settings
 
-_thread_locals = local()
+# A ContextVar rather than threading.local so the user follows the request
+# across await boundaries under ASGI as well as WSGI threads
+_current_user = ContextVar('current_user', default=None)
 
 
 def get_current_user():
     """
-    Get the current user from thread-local storage.
+    Get the current user from request-local context.
     Used by custom managers to filter querysets automatically.
     """
-    return getattr(_thread_locals, 'user', None)
+    return _current_user.get()
 
 
 class CurrentUserMiddleware:
     """
-    Middleware that stores the current request user in thread-local storage.
+    Middleware that stores the current request user in request-local context.
     This enables automatic row-level security filtering in model managers.
     """
 
@@ -24,17 +26,14 @@ class CurrentUserMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
-        # Store current user in thread-local storage
-        _thread_locals.user = getattr(request, 'user', None)
+        # Store current user for the duration of the request
+        token = _current_user.set(getattr(request, 'user', None))
 
         try:
-            response = self.get_response(request)
+            return self.get_response(request)
         finally:
-            # Clean up thread-local storage after request
-            if hasattr(_thread_locals, 'user'):
-                del _thread_locals.user
-
-        return response
+            # Restore the previous value after the request
+            _current_user.reset(token)
 
 
 class CacheDebugMiddleware:
@@ -42,6 +41,13 @@ class CacheDebugMiddleware:
 
     def __init__(self, get_response):
         self.get_response = get_response
+        # Middleware is instantiated once per process, so look up the Redis
+        # connection here rather than on every request
+        try:
+            from django_redis import get_redis_connection
+            self.con = get_redis_connection("default")
+        except Exception:
+            self.con = None
 
     def __call__(self, request):
         if not settings.DEBUG:
@@ -49,16 +55,16 @@ class CacheDebugMiddleware:
 
         start_time = time.time()
 
+        # Only the "stats" section carries the keyspace counters
         initial_hits = initial_misses = 0
-        con = None
-        try:
-            from django_redis import get_redis_connection
-            con = get_redis_connection("default")
-            info = con.info()
-            initial_hits = info.get('keyspace_hits', 0)
-            initial_misses = info.get('keyspace_misses', 0)
-        except Exception:
-            pass
+        con = self.con
+        if con:
+            try:
+                info = con.info("stats")
+                initial_hits = info.get('keyspace_hits', 0)
+                initial_misses = info.get('keyspace_misses', 0)
+            except Exception:
+                con = None
 
         response = self.get_response(request)
 
@@ -67,7 +73,7 @@ class CacheDebugMiddleware:
 
         if con:
             try:
-                info = con.info()
+                info = con.info("stats")
                 response['X-Cache-Hits'] = str(info.get('keyspace_hits', 0) - initial_hits)
                 response['X-Cache-Misses'] = str(info.get('keyspace_misses', 0) - initial_misses)
             except Exception:
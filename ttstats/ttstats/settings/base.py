@@ -130,6 +130,7 @@ CSRF_COOKIE_SAMESITE = 'Lax'
 
 # Default email settings (override in prod.py)
 DEFAULT_FROM_EMAIL = 'noreply@localhost'
+EMAIL_ASYNC = False  # Send request-triggered emails on a background thread
 
 # Authentication backends (for passkey + password login)
 AUTHENTICATION_BACKENDS = [
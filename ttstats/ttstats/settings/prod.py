@@ -2,6 +2,22 @@
 from .base import *
 import os
 
+_TRUTHY = frozenset({'true', '1', 'yes', 'on'})
+
+
+def _env_bool(name, default):
+    """Read a boolean flag from the environment."""
+    return os.environ.get(name, default).strip().lower() in _TRUTHY
+
+
+def _env_int(name, default):
+    """Read an integer from the environment, falling back to default if unset or invalid."""
+    try:
+        return int(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
 DEBUG = False
 
 # CRITICAL: Use environment variable
@@ -13,7 +29,7 @@ if not SECRET_KEY:
 allowed_hosts_str = os.environ.get('ALLOWED_HOSTS', '')
 if not allowed_hosts_str:
     raise ValueError("ALLOWED_HOSTS environment variable must be set in production")
-ALLOWED_HOSTS = [h.strip() for h in allowed_hosts_str.split(',') if h.strip()]
+ALLOWED_HOSTS = list(filter(None, map(str.strip, allowed_hosts_str.split(','))))
 if not ALLOWED_HOSTS:
     raise ValueError("ALLOWED_HOSTS must contain at least one valid host")
 
@@ -43,8 +59,11 @@ SECURE_HSTS_PRELOAD = True
 # Tighter session settings for production
 SESSION_COOKIE_AGE = 86400  # 1 day instead of 2 weeks
 
-# Content Security Policy (CSP)
-MIDDLEWARE.insert(1, 'csp.middleware.CSPMiddleware')
+# Content Security Policy (CSP). Referenced by dotted path only so csp is
+# imported by Django's middleware loader, not at settings import time.
+# Guarded so re-importing settings doesn't add it twice.
+if 'csp.middleware.CSPMiddleware' not in MIDDLEWARE:
+    MIDDLEWARE.insert(1, 'csp.middleware.CSPMiddleware')
 
 # CSP settings - adjust based on your actual requirements
 CSP_DEFAULT_SRC = ("'self'",)
@@ -73,9 +92,17 @@ STATIC_ROOT = '/app/static/'
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'prod': {
+            'format': '{asctime} {levelname} {name} {message}',
+            'style': '{',
+        },
+    },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
+            'formatter': 'prod',
+            'level': 'INFO',
         },
     },
     'root': {
@@ -93,17 +120,18 @@ LOGGING = {
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.eu.mailgun.org')
-EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 587))
-EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'true').lower() in ['true', '1', 'yes']
+EMAIL_PORT = _env_int('EMAIL_PORT', 587)
+EMAIL_USE_TLS = _env_bool('EMAIL_USE_TLS', 'true')
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', '')  
+EMAIL_ASYNC = True  # Don't hold requests open on SMTP round-trips
 
 SITE_PROTOCOL = 'https'
 SITE_DOMAIN = os.environ.get('SITE_DOMAIN')
+if not SITE_DOMAIN:
+    raise ValueError("SITE_DOMAIN environment variable must be set in production")
 
 # WebAuthn configuration for production
-OTP_WEBAUTHN_RP_ID = os.environ.get("SITE_DOMAIN")
-OTP_WEBAUTHN_ALLOWED_ORIGINS = [
-    f"https://{os.environ.get('SITE_DOMAIN')}"
-]
\ No newline at end of file
+OTP_WEBAUTHN_RP_ID = SITE_DOMAIN
+OTP_WEBAUTHN_ALLOWED_ORIGINS = [f"{SITE_PROTOCOL}://{SITE_DOMAIN}"]
\ No newline at end of file
@@ -8,17 +8,17 @@ DATABASES = {
     }
 }
 
-# Use console email backend for tests
-EMAIL_BACKEND = 'django.core.mail.backends.locator.EmailBackend'
+# Use in-memory email backend for tests
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
 
-# Disable migrations for faster tests (optional)
+# Disable migrations for faster tests
 class DisableMigrations:
     def __contains__(self, item):
         return True
     def __getitem__(self, item):
         return None
 
-# MIGRATION_MODULES = DisableMigrations()  # Uncomment if you want faster tests
+MIGRATION_MODULES = DisableMigrations()  # Build the schema from models; pass --keepdb to reuse it
 
 # Disable logging during tests
 LOGGING = {}
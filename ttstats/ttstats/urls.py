@@ -15,16 +15,33 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 import os
+import re
 
 from django.contrib import admin
+from django.core.exceptions import ImproperlyConfigured
 from django.urls import path, include
 from django.views.generic import RedirectView
 
 from pingpong.views import CustomLoginView
 
+
+def _normalize_admin_url(value):
+    """Strip whitespace and slashes, then add the single trailing slash path() expects."""
+    value = value.strip().strip('/')
+    if not value:
+        raise ImproperlyConfigured("ADMIN_URL must not be empty")
+    value += '/'
+    # Only plain path characters, so path() never sees <converter> syntax
+    if not re.fullmatch(r'[A-Za-z0-9_\-/]+', value):
+        raise ImproperlyConfigured(
+            f"ADMIN_URL may only contain letters, digits, '_', '-' and '/': {value!r}"
+        )
+    return value
+
+
 # Admin URL can be customized via environment variable for security
 # Set ADMIN_URL to a random string in production (e.g., 'secret-admin-abc123/')
-ADMIN_URL = os.environ.get('ADMIN_URL', 'admin/')
+ADMIN_URL = _normalize_admin_url(os.environ.get('ADMIN_URL', 'admin/'))
 
 urlpatterns = [
     path('', RedirectView.as_view(url='pingpong/', permanent=False)),
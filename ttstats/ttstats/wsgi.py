@@ -10,7 +10,12 @@ https://docs.djangoproject.com/en/6.0/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ttstats.settings')
 
 application = get_wsgi_application()
+
+# Import the URLconf (and with it every view module) now rather than on the
+# first request, so a preloading server shares it across forked workers
+get_resolver().url_patterns